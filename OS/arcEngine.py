@@ -0,0 +1,121 @@
+from collections import OrderedDict
+
+from simulationLog import SimulationLog, simulate, run_accesses
+
+class ARCEngine:
+    """
+    Adaptive Replacement Cache (Megiddo and Modha). T1 holds pages seen
+    once recently and T2 pages seen at least twice; the ghost lists B1
+    and B2 remember pages recently evicted from each. A hit in a ghost
+    list moves the target size p of T1 towards the list that would have
+    kept the page, so the split between recency and frequency adapts
+    to the workload and one-off scans cannot flush T2.
+    All lists are OrderedDicts (LRU first), so every step is O(1).
+    """
+    def __init__(self, frames):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.p = 0  # Target size of T1
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.resident = {}  # Resident pages in load order
+        self.page_faults = 0
+        self.hits = 0
+
+    def _replace(self, in_b2):
+        # Evict from T1 or T2 into the matching ghost list
+        t1 = self.t1
+        if t1 and (len(t1) > self.p or (in_b2 and len(t1) == self.p)):
+            old_page = t1.popitem(last=False)[0]
+            self.b1[old_page] = None
+        else:
+            old_page = self.t2.popitem(last=False)[0]
+            self.b2[old_page] = None
+        del self.resident[old_page]
+        return old_page
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+        capacity = self.capacity
+
+        if page in t1:
+            self.hits += 1
+            del t1[page]
+            t2[page] = None
+            return True, None
+        if page in t2:
+            self.hits += 1
+            t2.move_to_end(page)
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        if page in b1:
+            # Recency would have kept it: grow T1
+            self.p = min(capacity, self.p + max(len(b2) // len(b1), 1))
+            old_page = self._replace(False)
+            del b1[page]
+            t2[page] = None
+        elif page in b2:
+            # Frequency would have kept it: shrink T1
+            self.p = max(0, self.p - max(len(b1) // len(b2), 1))
+            old_page = self._replace(True)
+            del b2[page]
+            t2[page] = None
+        else:
+            if len(t1) + len(b1) == capacity:
+                if len(t1) < capacity:
+                    b1.popitem(last=False)
+                    old_page = self._replace(False)
+                else:
+                    old_page = t1.popitem(last=False)[0]
+                    del self.resident[old_page]
+            else:
+                total = len(t1) + len(t2) + len(b1) + len(b2)
+                if total >= capacity:
+                    if total == 2 * capacity:
+                        b2.popitem(last=False)
+                    old_page = self._replace(False)
+            t1[page] = None
+        self.resident[page] = None
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        return run_accesses(self, reference_string)
+
+    def frames(self):
+        """
+        Resident pages in load order
+        """
+        return list(self.resident)
+
+    def __contains__(self, page):
+        return page in self.resident
+
+    def __len__(self):
+        return len(self.resident)
+
+def arc_page_replacement(reference_string, frames, verbose=False, progress=None):
+    """
+    Simulate ARC over reference_string. When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    """
+    engine = ARCEngine(frames)
+    detailed_log = SimulationLog()
+
+    if verbose:
+        print(f"\n--- ARC Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress)
@@ -0,0 +1,173 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from batchFifo import batch_fifo_faults, trace_universe
+from fifoCurve import BATCH_MAX_CELLS
+from policies import ENGINES, choose_policies
+from stackDistance import lru_fault_curve
+from sweepExecutor import POLICIES, batches_fifo, iter_jobs
+from traceReader import is_binary_trace, load_trace, memmap_binary_trace
+
+# Columns of every output row, in CSV order
+FIELDS = ('trace', 'frames', 'policy', 'faults', 'hit_ratio', 'references')
+# Pages read at a time and fed to every frame size's engine
+TRACE_CHUNK = 1 << 16
+
+def parse_frame_range(text):
+    """
+    Frame counts from a range such as "3", "3-10" or "8-64:8" (start,
+    inclusive end and step)
+    """
+    bounds, _, step = text.partition(':')
+    start, _, end = bounds.partition('-')
+    start = int(start)
+    end = int(end) if end else start
+    step = int(step) if step else 1
+    if start < 1 or end < start or step < 1:
+        raise ValueError(f"Invalid frame range: {text}")
+    return list(range(start, end + 1, step))
+
+def batch_fifo_trace(path, frame_sizes):
+    """
+    (pages, universe) when FIFO runs frame_sizes as one batch job (a
+    binary trace, enough frame sizes and a residency matrix under
+    BATCH_MAX_CELLS), otherwise None. pages is a NumPy memmap and
+    universe its distinct pages, found in a chunked pass, so the trace
+    is never copied whole.
+    """
+    if not batches_fifo(frame_sizes) or not is_binary_trace(path):
+        return None
+    pages = memmap_binary_trace(path)
+    universe = trace_universe(pages)
+    if len(frame_sizes) * len(universe) > BATCH_MAX_CELLS:
+        return None
+    return pages, universe
+
+def run_trace_job(job):
+    """
+    Result rows for one job: (trace path, policy, frame sizes). The job
+    carries only the path; the worker opens the trace with load_trace
+    (memory-mapped when binary, streamed when text), so no trace is
+    copied into memory or pickled. LRU covers every frame size in one
+    stack-distance pass and FIFO may run as one batch (see
+    batch_fifo_trace); otherwise the trace is read once, TRACE_CHUNK
+    pages at a time, and each chunk runs through one counters-only
+    engine per frame size.
+    """
+    path, policy, frame_sizes = job
+    if policy == 'LRU':
+        curve = lru_fault_curve(load_trace(path), max(frame_sizes))
+        references = curve[0]
+        faults = [curve[frames] for frames in frame_sizes]
+    elif policy in ENGINES:
+        batch = batch_fifo_trace(path, frame_sizes) if policy == 'FIFO' else None
+        if batch is not None:
+            pages, universe = batch
+            references = len(pages)
+            faults = batch_fifo_faults(pages, frame_sizes, universe).tolist()
+        else:
+            engines = [ENGINES[policy](frames) for frames in frame_sizes]
+            pages = iter(load_trace(path))
+            references = 0
+            while True:
+                chunk = list(islice(pages, TRACE_CHUNK))
+                if not chunk:
+                    break
+                references += len(chunk)
+                for engine in engines:
+                    engine.run(chunk)
+            faults = [engine.page_faults for engine in engines]
+    else:
+        raise ValueError(f"Unknown policy: {policy}")
+    return [
+        {
+            'trace': path,
+            'frames': frames,
+            'policy': policy,
+            'faults': count,
+            'hit_ratio': round(((references - count) / references) * 100 if references > 0 else 0, 4),
+            'references': references
+        }
+        for frames, count in zip(frame_sizes, faults)
+    ]
+
+class RowWriter:
+    """
+    Writes result rows as CSV or JSON Lines, flushing after each job so
+    a reader sees results as they finish
+    """
+    def __init__(self, output, output_format):
+        self.output = output
+        self.csv = None
+        if output_format == 'csv':
+            self.csv = csv.DictWriter(output, fieldnames=FIELDS, lineterminator='\n')
+            self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv is not None:
+                self.csv.writerow(row)
+            else:
+                self.output.write(json.dumps(row) + "\n")
+        self.output.flush()
+
+def run_batch(traces, frame_sizes, policies=POLICIES, output=sys.stdout, output_format='csv', workers=None):
+    """
+    Fault counts of every policy on every trace at every frame size,
+    written to output as each job finishes (in completion order, not
+    sorted). There is one job per (trace, policy), covering all the
+    frame sizes. Returns the number of rows written.
+    """
+    for path in traces:
+        is_binary_trace(path)  # Fail on a missing or unreadable trace before any job runs
+    jobs = [(path, policy, list(frame_sizes)) for path in traces for policy in policies]
+    writer = RowWriter(output, output_format)
+    count = 0
+    for rows in iter_jobs(run_trace_job, jobs, workers):
+        writer.write(rows)
+        count += len(rows)
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare page replacement policies on trace files without prompts, "
+                    "streaming one row per (trace, frames, policy) as jobs finish")
+    parser.add_argument("traces", nargs="+", help="Trace files, text or binary")
+    parser.add_argument("--frames", nargs="+", required=True,
+                        help="Frame counts or ranges, e.g. 3 4 8-64:8 (start-end:step, end inclusive)")
+    parser.add_argument("--policies", default="",
+                        help="Comma-separated policies (default: FIFO,LRU,CLOCK)")
+    parser.add_argument("--format", choices=['csv', 'json'], default='csv',
+                        help="csv, or json for one JSON object per line")
+    parser.add_argument("--output", help="Write rows to this file instead of standard output")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU; 1 runs in-process)")
+    args = parser.parse_args(argv)
+
+    try:
+        frame_sizes = sorted({frames for text in args.frames for frames in parse_frame_range(text)})
+        policies = choose_policies(args.policies)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    start_time = time.perf_counter()
+    try:
+        count = run_batch(args.traces, frame_sizes, policies, output, args.format, args.workers)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            output.close()
+    print(f"{count} results in {time.perf_counter() - start_time:.2f} seconds", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
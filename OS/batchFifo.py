@@ -0,0 +1,102 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the batch engine needs it
+    np = None
+
+# References mapped to dense page ids at a time when the page universe
+# is given, so a memory-mapped trace is never copied whole
+BATCH_CHUNK = 1 << 20
+
+def trace_universe(trace, chunk_size=BATCH_CHUNK):
+    """
+    Sorted distinct pages of a 1-D trace, read chunk_size references at
+    a time: memory grows with the distinct pages, not the trace length
+    """
+    if np is None:
+        raise ImportError("trace_universe requires NumPy")
+    universe = np.unique(np.asarray(trace[:0]))
+    for start in range(0, len(trace), chunk_size):
+        universe = np.union1d(universe, np.unique(trace[start:start + chunk_size]))
+    return universe
+
+def batch_fifo_faults(trace, frame_sizes, universe=None):
+    """
+    FIFO page faults for many configurations at once. Each reference
+    advances the ring buffers of every configuration together with
+    NumPy operations, so the cost per reference is a few array ops
+    rather than one Python simulation per configuration.
+
+    trace is either a 1-D integer array, simulated once per entry of
+    frame_sizes, or a 2-D (batch, length) array of equal-length traces,
+    where frame_sizes is a single frame count or one per trace.
+    Returns an int64 vector of fault counts, one per configuration.
+
+    Residency is a (configurations x distinct pages) boolean matrix,
+    so memory grows with the page universe of the trace. For a 1-D
+    trace, universe may give its sorted distinct pages (see
+    trace_universe): pages are then mapped to dense ids BATCH_CHUNK
+    references at a time instead of in one full-length copy.
+    """
+    if np is None:
+        raise ImportError("batch_fifo_faults requires NumPy")
+
+    trace = np.asarray(trace)
+    capacities = np.atleast_1d(np.asarray(frame_sizes, dtype=np.int64))
+    if trace.ndim == 1:
+        configs = len(capacities)
+        traces = trace[np.newaxis, :]
+    elif trace.ndim == 2:
+        configs = trace.shape[0]
+        if len(capacities) == 1:
+            capacities = np.repeat(capacities, configs)
+        elif len(capacities) != configs:
+            raise ValueError("Need one frame size per trace, or a single frame size")
+        traces = trace
+    else:
+        raise ValueError("trace must be a 1-D or 2-D array")
+    if universe is not None and trace.ndim != 1:
+        raise ValueError("universe is only accepted with a 1-D trace")
+    if configs and capacities.min() < 1:
+        raise ValueError("Number of frames must be at least 1")
+
+    faults = np.zeros(configs, dtype=np.int64)
+    if configs == 0 or traces.shape[1] == 0:
+        return faults
+
+    # Dense page ids index the residency matrix
+    if universe is None:
+        universe, dense = np.unique(traces, return_inverse=True)
+        blocks = [dense.reshape(traces.shape)]
+    else:
+        universe = np.asarray(universe)
+        blocks = (np.searchsorted(universe, trace[start:start + BATCH_CHUNK])[np.newaxis, :]
+                  for start in range(0, len(trace), BATCH_CHUNK))
+
+    rows = np.arange(configs)
+    resident = np.zeros((configs, len(universe)), dtype=bool)
+    slots = np.zeros((configs, int(capacities.max())), dtype=np.int64)
+    hands = np.zeros(configs, dtype=np.int64)
+    filled = np.zeros(configs, dtype=np.int64)
+
+    for block in blocks:
+        if block.shape[0] == 1:
+            block = np.broadcast_to(block, (configs, block.shape[1]))
+        # One row of pages per reference
+        for pages in block.T:
+            miss = np.flatnonzero(~resident[rows, pages])
+            if len(miss) == 0:
+                continue
+            faults[miss] += 1
+            page = pages[miss]
+            hand = hands[miss]
+
+            # Page out the oldest page where the buffer is full
+            full = filled[miss] == capacities[miss]
+            resident[miss[full], slots[miss[full], hand[full]]] = False
+
+            slots[miss, hand] = page
+            resident[miss, page] = True
+            filled[miss] += ~full
+            hands[miss] = (hand + 1) % capacities[miss]
+
+    return faults
@@ -0,0 +1,147 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from fifoEngine import FIFOEngine, fifo_page_replacement
+from lruEngine import LRUEngine, lru_page_replacement
+from clockEngine import ClockEngine
+from arcEngine import ARCEngine
+from twoQueueEngine import TwoQueueEngine
+from lfuEngine import LFUEngine
+from optEngine import OPTEngine
+from stackDistance import lru_fault_curve
+from fifoCurve import fifo_fault_curve
+from batchFifo import batch_fifo_faults, np
+from workloads import WORKLOADS
+
+def make_workload(length, universe, seed=0, workload='uniform'):
+    """
+    Reference string of the named synthetic workload over pages
+    0..universe-1, materialised so every repeat times the same input
+    """
+    return list(WORKLOADS[workload](length, universe, seed))
+
+def run_engine(engine_class):
+    def run(reference_string, frames):
+        return engine_class(frames).run(reference_string)
+    return run
+
+ENGINES = {
+    'FIFO': run_engine(FIFOEngine),
+    'LRU': run_engine(LRUEngine),
+    'FIFO (logged)': lambda reference_string, frames: fifo_page_replacement(reference_string, frames)[0],
+    'LRU (logged)': lambda reference_string, frames: lru_page_replacement(reference_string, frames)[0],
+    'CLOCK': run_engine(ClockEngine),
+    'ARC': run_engine(ARCEngine),
+    '2Q': run_engine(TwoQueueEngine),
+    'LFU': run_engine(LFUEngine),
+    # The next-use index is built for each run, as it is part of OPT's cost
+    'OPT': lambda reference_string, frames: OPTEngine(frames, reference_string).run(reference_string),
+    'LRU curve': lambda reference_string, frames: lru_fault_curve(reference_string, frames)[frames],
+    'FIFO curve': lambda reference_string, frames: fifo_fault_curve(reference_string, frames)[frames],
+}
+if np is not None:
+    ENGINES['FIFO (batch)'] = lambda reference_string, frames: int(
+        batch_fifo_faults(np.asarray(reference_string), [frames])[0])
+
+def measure(function, *args, warmup=1, repeats=5):
+    """
+    Time function(*args) with perf_counter_ns after warm-up runs.
+    Returns min/median/mean/stdev in seconds.
+    """
+    for _ in range(warmup):
+        function(*args)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function(*args)
+        samples.append((time.perf_counter_ns() - start) / 1e9)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'samples': samples
+    }
+
+def peak_memory(function, *args):
+    """
+    Peak bytes allocated while running function(*args) once
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmarks(lengths, universes, frame_counts, engines=None, warmup=1, repeats=5, seed=0,
+                   workload='uniform'):
+    """
+    Benchmark every engine on every (length, universe, frames)
+    workload. Returns one record per run with timing statistics,
+    references per second and peak memory.
+    """
+    engines = engines or list(ENGINES)
+    records = []
+    for length in lengths:
+        for universe in universes:
+            reference_string = make_workload(length, universe, seed, workload)
+            for frames in frame_counts:
+                for name in engines:
+                    function = ENGINES[name]
+                    timing = measure(function, reference_string, frames, warmup=warmup, repeats=repeats)
+                    records.append({
+                        'engine': name,
+                        'workload': workload,
+                        'length': length,
+                        'universe': universe,
+                        'frames': frames,
+                        'faults': function(reference_string, frames),
+                        'seconds': timing,
+                        'refs_per_second': length / timing['median'] if timing['median'] > 0 else None,
+                        'peak_memory_bytes': peak_memory(function, reference_string, frames)
+                    })
+    return records
+
+def print_report(records):
+    print(f"{'Engine':<14} {'Length':>10} {'Universe':>9} {'Frames':>7} {'Median s':>10} {'Refs/s':>12} {'Peak MB':>9}")
+    for record in records:
+        refs_per_second = record['refs_per_second'] or 0
+        print(f"{record['engine']:<14} {record['length']:>10} {record['universe']:>9} {record['frames']:>7} "
+              f"{record['seconds']['median']:>10.4f} {refs_per_second:>12,.0f} "
+              f"{record['peak_memory_bytes'] / 1e6:>9.2f}")
+
+def write_json(records, path):
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'results': records
+    }
+    with open(path, "w") as output:
+        json.dump(report, output, indent=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the page replacement engines")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--universes", type=int, nargs="+", default=[1000])
+    parser.add_argument("--frames", type=int, nargs="+", default=[64])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=None)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workload", choices=list(WORKLOADS), default='uniform')
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    records = run_benchmarks(args.lengths, args.universes, args.frames, args.engines,
+                             args.warmup, args.repeats, args.seed, args.workload)
+    print_report(records)
+    if args.output:
+        write_json(records, args.output)
+        print(f"\nResults written to {args.output}")
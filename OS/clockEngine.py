@@ -0,0 +1,132 @@
+from simulationLog import SimulationLog, simulate
+
+class ClockEngine:
+    """
+    CLOCK (second-chance) page replacement. Frames and reference bits
+    live in preallocated arrays and a hand sweeps them, clearing bits
+    until it finds an unreferenced page to evict. With max_count > 1
+    this is GCLOCK: a hit raises the page's counter up to max_count
+    and the hand decrements it, so frequently used pages survive more
+    sweeps. Newly loaded pages start with a count of 1.
+    """
+    def __init__(self, frames, max_count=1):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        if not 1 <= max_count <= 255:
+            raise ValueError("max_count must be between 1 and 255")
+        self.capacity = frames
+        self.max_count = max_count
+        self.slots = [None] * frames
+        self.counts = bytearray(frames)  # Reference bits (GCLOCK counters)
+        self.index = {}  # page -> slot
+        self.filled = 0
+        self.hand = 0
+        self.page_faults = 0
+        self.hits = 0
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        slot = self.index.get(page)
+        if slot is not None:
+            self.hits += 1
+            counts = self.counts
+            if counts[slot] < self.max_count:
+                counts[slot] += 1
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        if self.filled < self.capacity:
+            slot = self.filled
+            self.filled += 1
+        else:
+            # Sweep, giving referenced pages a second chance
+            counts = self.counts
+            capacity = self.capacity
+            hand = self.hand
+            while counts[hand]:
+                counts[hand] -= 1
+                hand = (hand + 1) % capacity
+            slot = hand
+            self.hand = (hand + 1) % capacity
+            old_page = self.slots[slot]
+            del self.index[old_page]
+        self.slots[slot] = page
+        self.counts[slot] = 1
+        self.index[page] = slot
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        index = self.index
+        slots = self.slots
+        counts = self.counts
+        capacity = self.capacity
+        max_count = self.max_count
+        filled = self.filled
+        hand = self.hand
+        hits = 0
+        faults = 0
+        for page in reference_string:
+            slot = index.get(page)
+            if slot is not None:
+                hits += 1
+                if counts[slot] < max_count:
+                    counts[slot] += 1
+                continue
+            faults += 1
+            if filled < capacity:
+                slot = filled
+                filled += 1
+            else:
+                while counts[hand]:
+                    counts[hand] -= 1
+                    hand += 1
+                    if hand == capacity:
+                        hand = 0
+                slot = hand
+                hand += 1
+                if hand == capacity:
+                    hand = 0
+                del index[slots[slot]]
+            slots[slot] = page
+            counts[slot] = 1
+            index[page] = slot
+        self.filled = filled
+        self.hand = hand
+        self.hits += hits
+        self.page_faults += faults
+        return self.page_faults
+
+    def frames(self):
+        """
+        Resident pages by frame slot
+        """
+        return self.slots[:self.filled]
+
+    def __contains__(self, page):
+        return page in self.index
+
+    def __len__(self):
+        return self.filled
+
+def clock_page_replacement(reference_string, frames, verbose=False, progress=None, max_count=1):
+    """
+    Simulate CLOCK (GCLOCK when max_count > 1) over reference_string.
+    When given, progress(steps) is called every PROGRESS_INTERVAL
+    references.
+    """
+    engine = ClockEngine(frames, max_count)
+    detailed_log = SimulationLog(replace_in_place=True)
+
+    if verbose:
+        print(f"\n--- CLOCK Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress)
@@ -0,0 +1,58 @@
+from fifoEngine import FIFOEngine
+from batchFifo import batch_fifo_faults, np
+
+# Frame sizes at which one NumPy pass over the trace beats one
+# counters-only engine run per size
+BATCH_MIN_SIZES = 128
+# Largest residency matrix (sizes x distinct pages) the batch may allocate
+BATCH_MAX_CELLS = 1 << 26
+
+def fifo_fault_curve(reference_string, max_frames=None):
+    """
+    FIFO page faults for every frame count from 0 to max_frames, laid
+    out like lru_fault_curve: curve[f] is the fault count with f frames.
+    FIFO has no stack property, so each size needs its own simulation,
+    but work is shared where it can be:
+    - immediate repeats of a page hit at every size, so they are
+      dropped before simulating;
+    - from the number of distinct pages up, only the first reference
+      to each page faults, so those sizes are not simulated;
+    - the remaining sizes run in one NumPy batch pass when there are
+      many of them, or as counters-only engine runs otherwise.
+    When max_frames is None the curve runs up to the number of distinct
+    pages, after which it stays flat.
+    """
+    trace = []
+    total_references = 0
+    previous = None
+    for page in reference_string:
+        total_references += 1
+        if page != previous:
+            trace.append(page)
+            previous = page
+
+    distinct = len(set(trace))
+    if max_frames is None:
+        max_frames = distinct
+
+    sizes = list(range(1, min(max_frames, distinct - 1) + 1))
+    if np is not None and len(sizes) >= BATCH_MIN_SIZES and len(sizes) * distinct <= BATCH_MAX_CELLS:
+        faults = batch_fifo_faults(np.asarray(trace), sizes).tolist()
+    else:
+        faults = [FIFOEngine(frames).run(trace) for frames in sizes]
+
+    curve = [total_references] + faults
+    curve.extend([distinct] * (max_frames + 1 - len(curve)))
+    return curve
+
+def belady_anomalies(curve):
+    """
+    Frame sizes where adding a frame raised the fault count (Belady's
+    anomaly), given a fault curve. Returns (frames, faults, increase)
+    tuples, increase being the faults above frames - 1.
+    """
+    return [
+        (frames, curve[frames], curve[frames] - curve[frames - 1])
+        for frames in range(2, len(curve))
+        if curve[frames] > curve[frames - 1]
+    ]
@@ -0,0 +1,118 @@
+from simulationLog import SimulationLog, resume_run, simulate
+
+class FIFOEngine:
+    """
+    FIFO page replacement engine with O(1) membership, insert and evict.
+    Frames live in a preallocated ring buffer and a set of resident
+    pages is kept in sync with it, so no reference scans the frames.
+    """
+    def __init__(self, frames):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.slots = [None] * frames
+        self.resident = set()
+        self.hand = 0  # Next slot to fill; the oldest page once full
+        self.page_faults = 0
+        self.hits = 0
+
+    @classmethod
+    def from_state(cls, frames, resident, hits=0, page_faults=0):
+        """
+        Engine holding resident (oldest first, as frames() lists
+        them) with the given counters, to resume a run from a checkpoint
+        """
+        engine = cls(frames)
+        count = len(resident)
+        engine.slots[:count] = resident
+        engine.resident = set(resident)
+        engine.hand = count % frames
+        engine.hits = hits
+        engine.page_faults = page_faults
+        return engine
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        resident = self.resident
+        if page in resident:
+            self.hits += 1
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        hand = self.hand
+        if len(resident) == self.capacity:
+            # Page out the oldest page
+            old_page = self.slots[hand]
+            resident.remove(old_page)
+        self.slots[hand] = page
+        resident.add(page)
+        self.hand = (hand + 1) % self.capacity
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        resident = self.resident
+        slots = self.slots
+        capacity = self.capacity
+        hand = self.hand
+        hits = 0
+        faults = 0
+        for page in reference_string:
+            if page in resident:
+                hits += 1
+                continue
+            faults += 1
+            if len(resident) == capacity:
+                resident.remove(slots[hand])
+            slots[hand] = page
+            resident.add(page)
+            hand += 1
+            if hand == capacity:
+                hand = 0
+        self.hand = hand
+        self.hits += hits
+        self.page_faults += faults
+        return self.page_faults
+
+    def frames(self):
+        """
+        Resident pages from oldest to newest
+        """
+        if len(self.resident) < self.capacity:
+            return self.slots[:self.hand]
+        return self.slots[self.hand:] + self.slots[:self.hand]
+
+    def __contains__(self, page):
+        return page in self.resident
+
+    def __len__(self):
+        return len(self.resident)
+
+def fifo_page_replacement(reference_string, frames, verbose=False, progress=None, resume=None):
+    """
+    Simulate FIFO over reference_string. When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    resume is (previous reference string, previous log) from a run with
+    the same frames; the run then restarts from the last checkpoint
+    before the first changed reference, with an identical result.
+    """
+    if resume is None:
+        start = 0
+        engine = FIFOEngine(frames)
+        detailed_log = SimulationLog()
+    else:
+        start, detailed_log, resident, hits, page_faults = resume_run(*resume, reference_string)
+        engine = FIFOEngine.from_state(frames, resident, hits, page_faults)
+
+    if verbose:
+        print(f"\n--- FIFO Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress, start)
@@ -1,22 +1,17 @@
-from collections import deque
+from fifoEngine import FIFOEngine
 
 def fifo_page_replacement(reference_string, frames):
-    memory = deque(maxlen=frames)
-    page_faults = 0
+    engine = FIFOEngine(frames)
     
     print("\n--- FIFO Simulation ---")
     for page in reference_string:
-        if page not in memory:
-            page_faults += 1
-            if len(memory) == frames:
-                # Page out the oldest page
-                memory.popleft()
-            memory.append(page)
-            print(f"Page fault: {page} -> Current frames: {list(memory)}")
+        hit, _ = engine.access(page)
+        if not hit:
+            print(f"Page fault: {page} -> Current frames: {engine.frames()}")
         else:
-            print(f"Hit: {page} -> Current frames: {list(memory)}")
+            print(f"Hit: {page} -> Current frames: {engine.frames()}")
             
-    return page_faults
+    return engine.page_faults
 
 # Test case
 ref_str_fifo = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
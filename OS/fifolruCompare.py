@@ -1,113 +1,27 @@
-from collections import deque
+import sys
 import time
+from array import array
 
-def fifo_page_replacement(reference_string, frames, verbose=False):
-    memory = deque(maxlen=frames)
-    page_faults = 0
-    hits = 0
-    detailed_log = []
-    
-    if verbose:
-        print(f"\n--- FIFO Simulation (Frames: {frames}) ---")
-    
-    for i, page in enumerate(reference_string):
-        if page not in memory:
-            page_faults += 1
-            old_page = None
-            if len(memory) == frames:
-                old_page = memory[0]
-            memory.append(page)
-            
-            log_entry = {
-                'step': i + 1,
-                'page': page,
-                'action': 'Page Fault',
-                'frames': list(memory),
-                'replaced': old_page
-            }
-            detailed_log.append(log_entry)
-            
-            if verbose:
-                if old_page:
-                    print(f"Step {i+1}: Page fault: {page} (replaced {old_page}) -> Frames: {list(memory)}")
-                else:
-                    print(f"Step {i+1}: Page fault: {page} -> Frames: {list(memory)}")
-        else:
-            hits += 1
-            log_entry = {
-                'step': i + 1,
-                'page': page,
-                'action': 'Hit',
-                'frames': list(memory),
-                'replaced': None
-            }
-            detailed_log.append(log_entry)
-            
-            if verbose:
-                print(f"Step {i+1}: Hit: {page} -> Frames: {list(memory)}")
-    
-    total_references = len(reference_string)
-    hit_ratio = (hits / total_references) * 100 if total_references > 0 else 0
-    
-    return page_faults, hit_ratio, detailed_log
-
-def lru_page_replacement(reference_string, frames, verbose=False):
-    memory = []
-    page_faults = 0
-    hits = 0
-    detailed_log = []
-    
-    if verbose:
-        print(f"\n--- LRU Simulation (Frames: {frames}) ---")
-    
-    for i, page in enumerate(reference_string):
-        if page in memory:
-            hits += 1
-            memory.remove(page)
-            memory.append(page)
-            
-            log_entry = {
-                'step': i + 1,
-                'page': page,
-                'action': 'Hit',
-                'frames': memory.copy(),
-                'replaced': None
-            }
-            detailed_log.append(log_entry)
-            
-            if verbose:
-                print(f"Step {i+1}: Hit: {page} -> Frames: {memory}")
-        else:
-            page_faults += 1
-            old_page = None
-            if len(memory) == frames:
-                # Page out the least recently used (first element)
-                old_page = memory.pop(0)
-            memory.append(page)
-            
-            log_entry = {
-                'step': i + 1,
-                'page': page,
-                'action': 'Page Fault',
-                'frames': memory.copy(),
-                'replaced': old_page
-            }
-            detailed_log.append(log_entry)
-            
-            if verbose:
-                if old_page:
-                    print(f"Step {i+1}: Page fault: {page} (replaced {old_page}) -> Frames: {memory}")
-                else:
-                    print(f"Step {i+1}: Page fault: {page} -> Frames: {memory}")
-    
-    total_references = len(reference_string)
-    hit_ratio = (hits / total_references) * 100 if total_references > 0 else 0
-    
-    return page_faults, hit_ratio, detailed_log
+from policies import SIMULATORS, result_key, pick_winner, choose_policies
+from lockstep import lockstep_page_replacement
+from instrumentation import PolicyMetrics, write_metrics_json
+from traceReader import parse_reference_string, load_trace
+from sweepExecutor import POLICIES, run_sweep, compare_results, summarize
+from workloads import WORKLOADS
+from fifoCurve import fifo_fault_curve, belady_anomalies
+from shards import SAMPLED_POLICIES, sampled_sweep, lru_sampling_error
+from profiling import Profiler, phase
+from traceAnalysis import analyze_trace
 
-def run_comparison_test(reference_string, frames, test_name, verbose=False):
+def run_comparison_test(reference_string, frames, test_name, verbose=False, policies=POLICIES,
+                        diagnostics=False, metrics_path=None):
     """
-    Run both algorithms on the same test case and compare results
+    Run every policy on the same test case and compare results, with
+    Belady's OPT as the optimal baseline. All policies run in lockstep
+    over a single pass, which also finds the steps where they disagree.
+    With diagnostics (or a metrics_path to write them to as JSON) the
+    compared policies are instrumented: residency time, eviction age,
+    re-fault distance and cold vs capacity misses.
     """
     print(f"\n{'='*60}")
     print(f"TEST: {test_name}")
@@ -115,70 +29,176 @@ def run_comparison_test(reference_string, frames, test_name, verbose=False):
     print(f"Number of Frames: {frames}")
     print(f"{'='*60}")
     
-    # Run FIFO
-    start_time = time.time()
-    fifo_faults, fifo_hit_ratio, fifo_log = fifo_page_replacement(reference_string, frames, verbose)
-    fifo_time = time.time() - start_time
+    result = {
+        'test_name': test_name,
+        'reference_string': reference_string,
+        'frames': frames
+    }
+    
+    # Every policy and the OPT baseline in one pass
+    metrics = {policy: PolicyMetrics() for policy in policies} if diagnostics or metrics_path else None
+    runs, divergence = lockstep_page_replacement(reference_string, frames, tuple(policies) + ('OPT',),
+                                                 verbose, log=False, metrics=metrics, compared=tuple(policies))
+    faults = {}
+    for policy in policies:
+        page_faults, hit_ratio, _, elapsed = runs[policy]
+        faults[policy] = page_faults
+        key = result_key(policy)
+        result[f"{key}_faults"] = page_faults
+        result[f"{key}_hit_ratio"] = hit_ratio
+        result[f"{key}_time"] = elapsed
     
-    # Run LRU
-    start_time = time.time()
-    lru_faults, lru_hit_ratio, lru_log = lru_page_replacement(reference_string, frames, verbose)
-    lru_time = time.time() - start_time
+    opt_faults, opt_hit_ratio, _, opt_time = runs['OPT']
+    result['opt_faults'] = opt_faults
+    result['opt_hit_ratio'] = opt_hit_ratio
+    result['opt_time'] = opt_time
     
     # Display results
     print(f"\n--- COMPARISON RESULTS ---")
-    print(f"FIFO Algorithm:")
-    print(f"  - Page Faults: {fifo_faults}")
-    print(f"  - Hit Ratio: {fifo_hit_ratio:.2f}%")
-    print(f"  - Execution Time: {fifo_time:.6f} seconds")
+    for policy in policies:
+        key = result_key(policy)
+        print(f"{policy} Algorithm:")
+        print(f"  - Page Faults: {result[f'{key}_faults']}")
+        print(f"  - Hit Ratio: {result[f'{key}_hit_ratio']:.2f}%")
+        print(f"  - Execution Time: {result[f'{key}_time']:.6f} seconds")
+        print()
     
-    print(f"\nLRU Algorithm:")
-    print(f"  - Page Faults: {lru_faults}")
-    print(f"  - Hit Ratio: {lru_hit_ratio:.2f}%")
-    print(f"  - Execution Time: {lru_time:.6f} seconds")
+    print(f"OPT Algorithm (optimal baseline):")
+    print(f"  - Page Faults: {opt_faults}")
+    print(f"  - Hit Ratio: {opt_hit_ratio:.2f}%")
+    print(f"  - Execution Time: {opt_time:.6f} seconds")
     
     # Determine winner
-    if fifo_faults < lru_faults:
-        winner = "FIFO"
-        difference = lru_faults - fifo_faults
-    elif lru_faults < fifo_faults:
-        winner = "LRU"
-        difference = fifo_faults - lru_faults
-    else:
-        winner = "TIE"
-        difference = 0
+    winner, difference = pick_winner(faults)
+    result['winner'] = winner
+    result['difference'] = difference
     
     print(f"\n--- ANALYSIS ---")
     if winner == "TIE":
-        print("Both algorithms performed equally well!")
+        print("Best algorithms performed equally well!")
     else:
         print(f"Winner: {winner} (by {difference} fewer page faults)")
-        improvement = (difference / max(fifo_faults, lru_faults)) * 100
+        improvement = (difference / (faults[winner] + difference)) * 100
         print(f"Performance improvement: {improvement:.2f}%")
+    print("Faults above optimal: " + ", ".join(
+        f"{policy} +{faults[policy] - opt_faults}" for policy in policies))
     
-    return {
-        'test_name': test_name,
-        'reference_string': reference_string,
-        'frames': frames,
-        'fifo_faults': fifo_faults,
-        'fifo_hit_ratio': fifo_hit_ratio,
-        'fifo_time': fifo_time,
-        'lru_faults': lru_faults,
-        'lru_hit_ratio': lru_hit_ratio,
-        'lru_time': lru_time,
-        'winner': winner,
-        'difference': difference
+    # Steps where the compared policies disagree (OPT left out)
+    result['divergent_steps'] = divergence['steps']
+    print(f"Steps where policies disagree: {divergence['steps']} of {divergence['references']}")
+    for index, page, description in divergence['examples']:
+        print(f"  Step {index+1} (page {page}): {description}")
+    if divergence['steps'] > len(divergence['examples']):
+        print(f"  ... and {divergence['steps'] - len(divergence['examples'])} more")
+    
+    if diagnostics:
+        print(f"\n--- DIAGNOSTICS ---")
+        for policy in policies:
+            print(f"{policy}:")
+            for line in metrics[policy].summary().splitlines():
+                print(f"  - {line}")
+    if metrics_path:
+        write_metrics_json(metrics, metrics_path, test_name=test_name, frames=frames)
+        print(f"\nMetrics written to {metrics_path}")
+    
+    return result
+
+def run_trace_test(path, frames, policies=POLICIES, analyze=False):
+    """
+    Replay a trace file through every policy in lockstep. Text traces
+    are streamed and binary traces memory-mapped in a single pass, so
+    the trace is read once and never held in memory. With analyze, a
+    second streamed pass reports its reuse distances, working sets and
+    locality phases.
+    """
+    print(f"\n{'='*60}")
+    print(f"TRACE: {path}")
+    print(f"Number of Frames: {frames}")
+    print(f"{'='*60}")
+    
+    result = {
+        'trace': path,
+        'frames': frames
     }
+    runs, divergence = lockstep_page_replacement(load_trace(path), frames, policies, log=False, examples=0)
+    for policy in policies:
+        page_faults, hit_ratio, _, elapsed = runs[policy]
+        
+        print(f"{policy:<5} - Page Faults: {page_faults}, Hit Ratio: {hit_ratio:.2f}%, Time: {elapsed:.6f} seconds")
+        key = result_key(policy)
+        result[f"{key}_faults"] = page_faults
+        result[f"{key}_hit_ratio"] = hit_ratio
+        result[f"{key}_time"] = elapsed
+    result['divergent_steps'] = divergence['steps']
+    print(f"Steps where policies disagree: {divergence['steps']} of {divergence['references']}")
+    
+    if analyze:
+        print(f"\nTrace analysis:\n{analyze_trace(load_trace(path)).summary()}")
+    
+    return result
 
-def run_comprehensive_analysis():
+def run_anomaly_test(reference_string, max_frames=None):
     """
-    Run multiple test scenarios and provide comprehensive analysis
+    FIFO fault counts over a whole frame range (up to the number of
+    distinct pages by default), reporting every frame size where one
+    more frame causes more faults (Belady's anomaly)
+    """
+    print(f"\n{'='*60}")
+    print("BELADY'S ANOMALY CHECK (FIFO)")
+    print(f"Reference String: {reference_string}")
+    print(f"{'='*60}")
+    
+    curve = fifo_fault_curve(reference_string, max_frames)
+    anomalies = belady_anomalies(curve)
+    increases = {frames: increase for frames, _, increase in anomalies}
+    
+    for frames in range(1, len(curve)):
+        note = f"  <- anomaly: +{increases[frames]} faults" if frames in increases else ""
+        print(f"Frames: {frames:<4} Page Faults: {curve[frames]}{note}")
+    
+    if anomalies:
+        print(f"\nBelady's anomaly at {len(anomalies)} frame size(s): " + ", ".join(
+            f"{frames} frames (+{increase})" for frames, _, increase in anomalies))
+    else:
+        print("\nNo Belady's anomaly: faults never increase with more frames in this range")
+    
+    return anomalies
+
+def synthetic_scenarios(length, universe, frames, seed=0):
+    """
+    Scenarios built from the seeded generators in workloads.py, for
+    running the comprehensive analysis at realistic trace sizes. Each
+    reference string is an array('q') (8 bytes a page rather than a
+    list of int objects), which still indexes, has a length and pickles
+    compactly for the sweep's worker processes.
+    """
+    return [
+        {
+            'name': f"Synthetic {name} ({length} refs)",
+            'reference_string': array('q', make_stream(length, universe, seed)),
+            'frames': frames
+        }
+        for name, make_stream in WORKLOADS.items()
+    ]
+
+def run_comprehensive_analysis(workers=None, test_scenarios=None, policies=POLICIES, sample_rate=None,
+                               validate=False):
+    """
+    Run multiple test scenarios and provide comprehensive analysis.
+    workers sets the process pool size (1 runs everything in-process);
+    test_scenarios defaults to the built-in hand-written cases.
+    policies names the SIMULATORS entries to compare.
+    With sample_rate (0 < rate <= 1) FIFO and LRU fault counts are
+    estimated from a hash-sampled fraction of each trace instead of
+    simulated exactly. validate also reports the LRU estimate's error
+    against an exact run per scenario; that exact pass costs more than
+    the estimate, so it is off by default.
     """
     print("COMPREHENSIVE PAGE REPLACEMENT ALGORITHM COMPARISON")
     print("=" * 80)
     
     # Test scenarios
-    test_scenarios = [
+    test_scenarios = test_scenarios or [
         {
             'name': 'Basic Test Case',
             'reference_string': [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1],
@@ -206,55 +226,58 @@ def run_comprehensive_analysis():
         }
     ]
     
-    all_results = []
+    if sample_rate is not None:
+        # Approximate mode: only policies with a sampled estimate
+        policies = tuple(policy for policy in policies if policy in SAMPLED_POLICIES) or SAMPLED_POLICIES
+        print(f"APPROXIMATE MODE: sampling {sample_rate:.2%} of pages ({', '.join(policies)})")
+        table = sampled_sweep(test_scenarios, sample_rate, policies, workers=workers)
+        for scenario in test_scenarios if validate else ():
+            largest, mean = lru_sampling_error(scenario['reference_string'], scenario['frames'], sample_rate)
+            print(f"{scenario['name']}: LRU miss-ratio error vs exact - max {largest:.2f}, mean {mean:.2f} percentage points")
+    else:
+        # Every (scenario, frame size, policy) job runs in a process pool
+        table = run_sweep(test_scenarios, policies, workers=workers)
+    all_results = compare_results(test_scenarios, table, policies)
     
-    for scenario in test_scenarios:
-        for frame_size in scenario['frames']:
-            result = run_comparison_test(
-                scenario['reference_string'], 
-                frame_size, 
-                f"{scenario['name']} - {frame_size} frames",
-                verbose=False
-            )
-            all_results.append(result)
+    for result in all_results:
+        print(f"\nTEST: {result['test_name']}")
+        for policy in policies:
+            key = result_key(policy)
+            print(f"  {policy:<5} - Page Faults: {result[f'{key}_faults']}, Hit Ratio: {result[f'{key}_hit_ratio']:.2f}%")
+        if result['winner'] == "TIE":
+            print("  Winner: TIE")
+        else:
+            print(f"  Winner: {result['winner']} (by {result['difference']} fewer page faults)")
     
     # Summary analysis
     print(f"\n{'='*80}")
     print("SUMMARY ANALYSIS")
     print(f"{'='*80}")
     
-    fifo_wins = sum(1 for r in all_results if r['winner'] == 'FIFO')
-    lru_wins = sum(1 for r in all_results if r['winner'] == 'LRU')
-    ties = sum(1 for r in all_results if r['winner'] == 'TIE')
-    
-    print(f"Total Tests Run: {len(all_results)}")
-    print(f"FIFO Wins: {fifo_wins}")
-    print(f"LRU Wins: {lru_wins}")
-    print(f"Ties: {ties}")
+    summary = summarize(all_results, policies)
     
-    # Average performance
-    avg_fifo_faults = sum(r['fifo_faults'] for r in all_results) / len(all_results)
-    avg_lru_faults = sum(r['lru_faults'] for r in all_results) / len(all_results)
-    avg_fifo_hit_ratio = sum(r['fifo_hit_ratio'] for r in all_results) / len(all_results)
-    avg_lru_hit_ratio = sum(r['lru_hit_ratio'] for r in all_results) / len(all_results)
+    print(f"Total Tests Run: {summary['total']}")
+    for policy in policies:
+        print(f"{policy} Wins: {summary['wins'][policy]}")
+    print(f"Ties: {summary['ties']}")
     
     print(f"\nAverage Performance:")
-    print(f"FIFO - Avg Page Faults: {avg_fifo_faults:.2f}, Avg Hit Ratio: {avg_fifo_hit_ratio:.2f}%")
-    print(f"LRU  - Avg Page Faults: {avg_lru_faults:.2f}, Avg Hit Ratio: {avg_lru_hit_ratio:.2f}%")
+    for policy in policies:
+        print(f"{policy:<5} - Avg Page Faults: {summary['avg_faults'][policy]:.2f}, "
+              f"Avg Hit Ratio: {summary['avg_hit_ratio'][policy]:.2f}%")
     
     # Best and worst cases
-    best_fifo = min(all_results, key=lambda x: x['fifo_faults'])
-    best_lru = min(all_results, key=lambda x: x['lru_faults'])
-    worst_fifo = max(all_results, key=lambda x: x['fifo_faults'])
-    worst_lru = max(all_results, key=lambda x: x['lru_faults'])
-    
     print(f"\nBest Performance:")
-    print(f"FIFO Best: {best_fifo['test_name']} - {best_fifo['fifo_faults']} faults")
-    print(f"LRU Best:  {best_lru['test_name']} - {best_lru['lru_faults']} faults")
+    for policy in policies:
+        key = f"{result_key(policy)}_faults"
+        best = min(all_results, key=lambda x: x[key])
+        print(f"{policy + ' Best:':<12} {best['test_name']} - {best[key]} faults")
     
     print(f"\nWorst Performance:")
-    print(f"FIFO Worst: {worst_fifo['test_name']} - {worst_fifo['fifo_faults']} faults")
-    print(f"LRU Worst:  {worst_lru['test_name']} - {worst_lru['lru_faults']} faults")
+    for policy in policies:
+        key = f"{result_key(policy)}_faults"
+        worst = max(all_results, key=lambda x: x[key])
+        print(f"{policy + ' Worst:':<12} {worst['test_name']} - {worst[key]} faults")
     
     return all_results
 
@@ -266,23 +289,38 @@ def interactive_test():
     print("INTERACTIVE TESTING MODE")
     print("="*60)
     
+    policies = POLICIES
+    profiling = False
     while True:
         print("\nOptions:")
         print("1. Test with custom reference string")
         print("2. Test with predefined scenarios")
         print("3. Run comprehensive analysis")
-        print("4. Exit")
+        print("4. Test with a trace file")
+        print(f"5. Choose policies (now: {', '.join(policies)})")
+        print("6. Check FIFO for Belady's anomaly")
+        print(f"7. Toggle profiling (now: {'on' if profiling else 'off'})")
+        print("8. Exit")
         
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
+        
+        # Runs are profiled per phase (cProfile + tracemalloc) when profiling is on
+        profiler = None
+        if profiling and choice in ('1', '2', '3', '4', '6'):
+            profiler = Profiler(time.strftime("profile_%Y%m%d_%H%M%S"))
         
         if choice == '1':
             try:
                 ref_str_input = input("Enter reference string (comma-separated): ")
-                reference_string = [int(x.strip()) for x in ref_str_input.split(',')]
+                with phase(profiler, 'parse'):
+                    reference_string = parse_reference_string(ref_str_input)
                 frames = int(input("Enter number of frames: "))
                 verbose = input("Show detailed steps? (y/n): ").lower().startswith('y')
+                diagnostics = input("Show diagnostics (residency, eviction age, re-faults)? (y/n): ").lower().startswith('y')
                 
-                result = run_comparison_test(reference_string, frames, "Custom Test", verbose)
+                with phase(profiler, 'simulate'):
+                    result = run_comparison_test(reference_string, frames, "Custom Test", verbose,
+                                                 policies=policies, diagnostics=diagnostics)
                 
             except ValueError:
                 print("Invalid input! Please enter numbers only.")
@@ -295,20 +333,78 @@ def interactive_test():
                 ([1, 2, 3, 1, 4, 2, 5, 1, 2, 3, 4, 5], 3)
             ]
             
-            for i, (ref_str, frames) in enumerate(test_cases, 1):
-                run_comparison_test(ref_str, frames, f"Predefined Test {i}", verbose=False)
+            with phase(profiler, 'simulate'):
+                for i, (ref_str, frames) in enumerate(test_cases, 1):
+                    run_comparison_test(ref_str, frames, f"Predefined Test {i}", verbose=False,
+                                        policies=policies)
                 
         elif choice == '3':
-            run_comprehensive_analysis()
+            try:
+                rate = input("Sampling rate for approximate mode on large synthetic traces (blank for exact): ").strip()
+                if rate:
+                    rate = float(rate)
+                    validate = input("Check the LRU estimate against an exact run (slower)? (y/n): ").lower().startswith('y')
+                    with phase(profiler, 'parse'):
+                        scenarios = synthetic_scenarios(200000, 20000, [1000, 2000, 5000])
+                    with phase(profiler, 'simulate'):
+                        run_comprehensive_analysis(test_scenarios=scenarios, policies=policies, sample_rate=rate,
+                                                   validate=validate)
+                else:
+                    with phase(profiler, 'simulate'):
+                        run_comprehensive_analysis(policies=policies)
+            except ValueError as error:
+                print(f"Invalid sampling rate: {error}")
             
         elif choice == '4':
+            try:
+                path = input("Enter trace file path: ").strip()
+                frames = int(input("Enter number of frames: "))
+                analyze = input("Analyze reuse distances and working sets? (y/n): ").lower().startswith('y')
+                with phase(profiler, 'simulate'):
+                    run_trace_test(path, frames, policies, analyze)
+            except ValueError:
+                print("Invalid input! The trace must contain page numbers only.")
+            except OSError as error:
+                print(f"Could not read trace: {error}")
+                
+        elif choice == '5':
+            try:
+                print(f"Available: {', '.join(SIMULATORS)}")
+                policies = choose_policies(input("Enter policies to compare (blank for defaults): "))
+            except ValueError as error:
+                print(error)
+                
+        elif choice == '6':
+            try:
+                ref_str_input = input("Enter reference string (blank for the classic anomaly trace): ").strip()
+                with phase(profiler, 'parse'):
+                    reference_string = parse_reference_string(ref_str_input) if ref_str_input else [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+                max_frames = input("Largest frame count (blank for all distinct pages): ").strip()
+                with phase(profiler, 'simulate'):
+                    run_anomaly_test(reference_string, int(max_frames) if max_frames else None)
+            except ValueError:
+                print("Invalid input! Please enter numbers only.")
+                
+        elif choice == '7':
+            profiling = not profiling
+            print(f"Profiling {'on: runs save profile_<time>.pstats and allocation sites' if profiling else 'off'}")
+                
+        elif choice == '8':
             print("Exiting...")
             break
             
         else:
-            print("Invalid choice! Please enter 1-4.")
+            print("Invalid choice! Please enter 1-8.")
+        
+        if profiler is not None:
+            print("\n" + profiler.finish())
 
 if __name__ == "__main__":
+    # With arguments, run unattended (see batchCompare.py --help)
+    if len(sys.argv) > 1:
+        from batchCompare import main
+        sys.exit(main())
+    
     # Run a quick demonstration
     print("PAGE REPLACEMENT ALGORITHM COMPARISON TOOL")
     print("=" * 80)
@@ -1,13 +1,43 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from collections import deque
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import multiprocessing
+import threading
 import time
 
+from optEngine import opt_page_replacement
+from policies import SIMULATORS, COMPARED_POLICIES, RESUMABLE_POLICIES, result_key, pick_winner
+from traceReader import parse_reference_string
+from logView import VirtualLogView, log_row
+from simulationWorker import SimulationTask
+from sweepExecutor import build_jobs, run_sweep, compare_results, summarize
+from resultCache import ResultCache, trace_fingerprint
+from lockstep import lockstep_page_replacement, describe_step
+from simulationLog import HIT
+from instrumentation import PolicyMetrics, write_metrics_json
+from profiling import Profiler
+from traceAnalysis import analyze_trace
+
+POLICY_COLORS = {'FIFO': '#2196F3', 'LRU': '#FF9800', 'CLOCK': '#009688', 'ARC': '#3F51B5',
+                 '2Q': '#795548', 'LFU': '#E91E63', 'OPT': '#4CAF50'}
+# Pages of the reference string spelled out in labels and reports
+REFERENCES_SHOWN = 50
+
+def format_reference_string(reference_string):
+    """
+    The reference string for a label: in full when short, otherwise its
+    first REFERENCES_SHOWN pages and the total, so long traces do not
+    put megabytes of text into a widget
+    """
+    if len(reference_string) <= REFERENCES_SHOWN:
+        return str(list(reference_string))
+    shown = ", ".join(map(str, reference_string[:REFERENCES_SHOWN]))
+    return f"[{shown}, ...] ({len(reference_string)} references)"
+
 class PageReplacementGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Page Replacement Algorithm Comparison Tool")
-        self.root.geometry("800x600")
+        self.root.geometry("800x750")
         self.root.configure(bg='#f0f0f0')
         
         # Test data
@@ -15,6 +45,17 @@ class PageReplacementGUI:
         self.demo_frames = 3
         self.current_ref_string = self.demo_ref_string.copy()
         self.current_frames = self.demo_frames
+        self.selected_policies = COMPARED_POLICIES
+        
+        # Results shared by every window, keyed by trace fingerprint, frames and policy
+        self.result_cache = ResultCache()
+        self.current_fingerprint = trace_fingerprint(self.current_ref_string)
+        # Logs of the previous test case that an edited one can resume from
+        self.resume_points = {}
+        # Profile each run (cProfile + tracemalloc) when checked
+        self.profiling = tk.BooleanVar(value=False)
+        # Instrument comparisons (residency, eviction age, re-faults) when checked
+        self.diagnostics = tk.BooleanVar(value=False)
         
         self.create_main_window()
         
@@ -35,7 +76,8 @@ class PageReplacementGUI:
                                   bg='#f0f0f0', fg='#333', padx=10, pady=10)
         info_frame.pack(pady=10, padx=20, fill='x')
         
-        test_info = f"TEST: Demo - Original Test Case\nReference String: {self.current_ref_string}\nNumber of Frames: {self.current_frames}"
+        test_info = (f"TEST: Demo - Original Test Case\nReference String: {format_reference_string(self.current_ref_string)}"
+                     f"\nNumber of Frames: {self.current_frames}")
         tk.Label(info_frame, text=test_info, font=("Arial", 10), bg='#f0f0f0', 
                 justify='left').pack(anchor='w')
         
@@ -64,6 +106,24 @@ class PageReplacementGUI:
                               font=("Arial", 10, "bold"), padx=20)
         update_btn.grid(row=2, column=0, columnspan=2, pady=10)
         
+        # Policies compared in the comparison and analysis windows
+        policies_frame = tk.LabelFrame(self.root, text="Compared Policies", font=("Arial", 12, "bold"), 
+                                      bg='#f0f0f0', fg='#333', padx=10, pady=5)
+        policies_frame.pack(pady=10, padx=20, fill='x')
+        
+        self.policy_vars = {}
+        for column, policy in enumerate(SIMULATORS):
+            var = tk.BooleanVar(value=policy in self.selected_policies)
+            self.policy_vars[policy] = var
+            tk.Checkbutton(policies_frame, text=policy, variable=var, command=self.update_policies, 
+                          bg='#f0f0f0', font=("Arial", 10)).grid(row=0, column=column, padx=10)
+        tk.Checkbutton(policies_frame, text="Profile runs (saves profile_<time>.pstats and allocation sites)", 
+                      variable=self.profiling, bg='#f0f0f0', font=("Arial", 10)).grid(
+                          row=1, column=0, columnspan=len(SIMULATORS), sticky='w', padx=10)
+        tk.Checkbutton(policies_frame, text="Collect diagnostics in comparisons (residency, eviction age, re-faults)", 
+                      variable=self.diagnostics, bg='#f0f0f0', font=("Arial", 10)).grid(
+                          row=2, column=0, columnspan=len(SIMULATORS), sticky='w', padx=10)
+        
         # Buttons frame
         buttons_frame = tk.Frame(self.root, bg='#f0f0f0')
         buttons_frame.pack(pady=30)
@@ -72,20 +132,36 @@ class PageReplacementGUI:
         btn_style = {"font": ("Arial", 12, "bold"), "width": 20, "height": 2, "relief": "raised", "bd": 3}
         
         fifo_btn = tk.Button(buttons_frame, text="FIFO Simulation", 
-                            command=self.open_fifo_window, bg='#2196F3', fg='white', **btn_style)
+                            command=self.open_fifo_window, bg=POLICY_COLORS['FIFO'], fg='white', **btn_style)
         fifo_btn.grid(row=0, column=0, padx=10, pady=10)
         
         lru_btn = tk.Button(buttons_frame, text="LRU Simulation", 
-                           command=self.open_lru_window, bg='#FF9800', fg='white', **btn_style)
+                           command=self.open_lru_window, bg=POLICY_COLORS['LRU'], fg='white', **btn_style)
         lru_btn.grid(row=0, column=1, padx=10, pady=10)
         
+        clock_btn = tk.Button(buttons_frame, text="CLOCK Simulation", 
+                             command=self.open_clock_window, bg=POLICY_COLORS['CLOCK'], fg='white', **btn_style)
+        clock_btn.grid(row=0, column=2, padx=10, pady=10)
+        
         compare_btn = tk.Button(buttons_frame, text="Comparison Results", 
                                command=self.open_comparison_window, bg='#9C27B0', fg='white', **btn_style)
-        compare_btn.grid(row=1, column=0, padx=10, pady=10)
+        arc_btn = tk.Button(buttons_frame, text="ARC Simulation", 
+                           command=self.open_arc_window, bg=POLICY_COLORS['ARC'], fg='white', **btn_style)
+        arc_btn.grid(row=1, column=0, padx=10, pady=10)
+        
+        two_queue_btn = tk.Button(buttons_frame, text="2Q Simulation", 
+                                 command=self.open_two_queue_window, bg=POLICY_COLORS['2Q'], fg='white', **btn_style)
+        two_queue_btn.grid(row=1, column=1, padx=10, pady=10)
+        
+        lfu_btn = tk.Button(buttons_frame, text="LFU Simulation", 
+                           command=self.open_lfu_window, bg=POLICY_COLORS['LFU'], fg='white', **btn_style)
+        lfu_btn.grid(row=1, column=2, padx=10, pady=10)
+        
+        compare_btn.grid(row=2, column=0, padx=10, pady=10)
         
         analysis_btn = tk.Button(buttons_frame, text="Comprehensive Analysis", 
                                 command=self.open_analysis_window, bg='#F44336', fg='white', **btn_style)
-        analysis_btn.grid(row=1, column=1, padx=10, pady=10)
+        analysis_btn.grid(row=2, column=1, padx=10, pady=10, columnspan=2)
         
         # Exit button
         exit_btn = tk.Button(self.root, text="Exit", command=self.root.quit, 
@@ -96,369 +172,386 @@ class PageReplacementGUI:
     def update_test_case(self):
         try:
             ref_str_text = self.ref_string_entry.get().strip()
-            self.current_ref_string = [int(x.strip()) for x in ref_str_text.split(',')]
-            self.current_frames = int(self.frames_entry.get().strip())
+            profiler = self.new_profiler()
+            if profiler is None:
+                reference_string = parse_reference_string(ref_str_text)
+            else:
+                # Finished even when the input does not parse
+                with profiler, profiler.phase('parse'):
+                    reference_string = parse_reference_string(ref_str_text)
+                self.show_profile(profiler)
+            frames = int(self.frames_entry.get().strip())
+            if reference_string != self.current_ref_string or frames != self.current_frames:
+                # Results for the old input will not be asked for again, but with
+                # the same frames their logs let the new input skip the unchanged prefix
+                self.resume_points = {}
+                if frames == self.current_frames:
+                    for policy in RESUMABLE_POLICIES:
+                        result = self.result_cache.peek((self.current_fingerprint, frames, policy))
+                        if result is not None:
+                            self.resume_points[policy] = (self.current_ref_string, result[2])
+                self.result_cache.clear()
+                self.current_fingerprint = trace_fingerprint(reference_string)
+            self.current_ref_string = reference_string
+            self.current_frames = frames
             messagebox.showinfo("Success", "Test case updated successfully!")
             self.create_main_window()  # Refresh the main window
         except ValueError:
             messagebox.showerror("Error", "Invalid input! Please enter valid numbers.")
+    
+    def update_policies(self):
+        selected = tuple(policy for policy, var in self.policy_vars.items() if var.get())
+        if not selected:
+            messagebox.showerror("Error", "Select at least one policy to compare.")
+            for policy in self.selected_policies:
+                self.policy_vars[policy].set(True)
+            return
+        self.selected_policies = selected
             
-    def fifo_page_replacement(self, reference_string, frames):
-        memory = deque(maxlen=frames)
-        page_faults = 0
-        hits = 0
-        detailed_log = []
-        
-        for i, page in enumerate(reference_string):
-            if page not in memory:
-                page_faults += 1
-                old_page = None
-                if len(memory) == frames:
-                    old_page = memory[0]
-                memory.append(page)
-                
-                log_entry = {
-                    'step': i + 1,
-                    'page': page,
-                    'action': 'Page Fault',
-                    'frames': list(memory),
-                    'replaced': old_page
-                }
-                detailed_log.append(log_entry)
-            else:
-                hits += 1
-                log_entry = {
-                    'step': i + 1,
-                    'page': page,
-                    'action': 'Hit',
-                    'frames': list(memory),
-                    'replaced': None
-                }
-                detailed_log.append(log_entry)
-        
-        total_references = len(reference_string)
-        hit_ratio = (hits / total_references) * 100 if total_references > 0 else 0
-        
-        return page_faults, hit_ratio, detailed_log
+    def fifo_page_replacement(self, reference_string, frames, progress=None):
+        return self.simulate('FIFO', reference_string, frames, progress)
     
-    def lru_page_replacement(self, reference_string, frames):
-        memory = []
-        page_faults = 0
-        hits = 0
-        detailed_log = []
-        
-        for i, page in enumerate(reference_string):
-            if page in memory:
-                hits += 1
-                memory.remove(page)
-                memory.append(page)
-                
-                log_entry = {
-                    'step': i + 1,
-                    'page': page,
-                    'action': 'Hit',
-                    'frames': memory.copy(),
-                    'replaced': None
-                }
-                detailed_log.append(log_entry)
-            else:
-                page_faults += 1
-                old_page = None
-                if len(memory) == frames:
-                    old_page = memory.pop(0)
-                memory.append(page)
-                
-                log_entry = {
-                    'step': i + 1,
-                    'page': page,
-                    'action': 'Page Fault',
-                    'frames': memory.copy(),
-                    'replaced': old_page
-                }
-                detailed_log.append(log_entry)
-        
-        total_references = len(reference_string)
-        hit_ratio = (hits / total_references) * 100 if total_references > 0 else 0
-        
-        return page_faults, hit_ratio, detailed_log
+    def lru_page_replacement(self, reference_string, frames, progress=None):
+        return self.simulate('LRU', reference_string, frames, progress)
+    
+    def opt_page_replacement(self, reference_string, frames, progress=None):
+        return self.simulate('OPT', reference_string, frames, progress)
+    
+    def simulate(self, policy, reference_string, frames, progress=None):
+        return self.timed_simulate(policy, reference_string, frames, progress)[:3]
+    
+    def timed_simulate(self, policy, reference_string, frames, progress=None):
+        """
+        (page faults, hit ratio, log, seconds) for a SIMULATORS policy or
+        OPT, served from the result cache when this trace, frame count
+        and policy were simulated before. The time is that of the run
+        which filled the cache. FIFO and LRU resume from the previous
+        test case's log when the current one was edited from it.
+        """
+        def compute():
+            simulator = opt_page_replacement if policy == 'OPT' else SIMULATORS[policy]
+            options = {}
+            if reference_string is self.current_ref_string and policy in self.resume_points:
+                options['resume'] = self.resume_points[policy]
+            start_time = time.perf_counter()
+            result = simulator(reference_string, frames, progress=progress, **options)
+            return result + (time.perf_counter() - start_time,)
+        
+        key = (self.fingerprint(reference_string), frames, policy)
+        return self.result_cache.get_or_compute(key, compute)
+    
+    def fingerprint(self, reference_string):
+        if reference_string is self.current_ref_string:
+            return self.current_fingerprint
+        return trace_fingerprint(reference_string)
+    
+    def trace_analysis(self, reference_string, progress=None):
+        """
+        Cached TraceAnalysis of reference_string; progress is passed to
+        analyze_trace on a miss
+        """
+        key = (self.fingerprint(reference_string), 'TRACE')
+        return self.result_cache.get_or_compute(key, lambda: analyze_trace(reference_string, progress=progress))
     
     def create_test_info_header(self, parent):
         info_frame = tk.LabelFrame(parent, text="Current Test Case", font=("Arial", 10, "bold"), 
                                   bg='#f8f8f8', fg='#333', padx=10, pady=5)
         info_frame.pack(pady=5, padx=10, fill='x')
         
-        test_info = f"TEST: Demo - Original Test Case\nReference String: {self.current_ref_string}\nNumber of Frames: {self.current_frames}"
+        test_info = (f"TEST: Demo - Original Test Case\nReference String: {format_reference_string(self.current_ref_string)}"
+                     f"\nNumber of Frames: {self.current_frames}")
+        cache = self.result_cache
+        test_info += f"\nResult Cache: {len(cache)} results, {cache.hit_rate():.1f}% hit rate"
         tk.Label(info_frame, text=test_info, font=("Arial", 9), bg='#f8f8f8', 
                 justify='left').pack(anchor='w')
         
         return info_frame
     
     def open_fifo_window(self):
-        fifo_window = tk.Toplevel(self.root)
-        fifo_window.title("FIFO Page Replacement Simulation")
-        fifo_window.geometry("900x700")
-        fifo_window.configure(bg='#f0f0f0')
-        
-        # Test info header
-        self.create_test_info_header(fifo_window)
-        
-        # Title
-        title_label = tk.Label(fifo_window, text="FIFO Page Replacement Simulation", 
-                              font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#2196F3')
-        title_label.pack(pady=10)
-        
-        # Run simulation
-        page_faults, hit_ratio, detailed_log = self.fifo_page_replacement(
-            self.current_ref_string, self.current_frames)
-        
-        # Results frame
-        results_frame = tk.LabelFrame(fifo_window, text="Results", font=("Arial", 12, "bold"), 
-                                     bg='#f0f0f0', fg='#333', padx=10, pady=10)
-        results_frame.pack(pady=10, padx=20, fill='x')
-        
-        results_text = f"Total Page Faults: {page_faults}\nHit Ratio: {hit_ratio:.2f}%\nTotal References: {len(self.current_ref_string)}"
-        tk.Label(results_frame, text=results_text, font=("Arial", 11), bg='#f0f0f0', 
-                justify='left').pack(anchor='w')
-        
-        # Detailed log
-        log_frame = tk.LabelFrame(fifo_window, text="Detailed Simulation Log", 
-                                 font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        log_frame.pack(pady=10, padx=20, fill='both', expand=True)
-        
-        # Create treeview for log
-        columns = ('Step', 'Page', 'Action', 'Frames', 'Replaced')
-        tree = ttk.Treeview(log_frame, columns=columns, show='headings', height=15)
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=100, anchor='center')
-        
-        # Populate treeview
-        for entry in detailed_log:
-            replaced = entry['replaced'] if entry['replaced'] else '-'
-            tree.insert('', tk.END, values=(
-                entry['step'], entry['page'], entry['action'], 
-                str(entry['frames']), replaced
-            ))
-        
-        # Scrollbar for treeview
-        scrollbar = ttk.Scrollbar(log_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Back button
-        back_btn = tk.Button(fifo_window, text="Back to Main", 
-                            command=fifo_window.destroy, bg='#607D8B', fg='white',
-                            font=("Arial", 10, "bold"))
-        back_btn.pack(pady=10)
+        self.open_simulation_window('FIFO')
     
     def open_lru_window(self):
-        lru_window = tk.Toplevel(self.root)
-        lru_window.title("LRU Page Replacement Simulation")
-        lru_window.geometry("900x700")
-        lru_window.configure(bg='#f0f0f0')
+        self.open_simulation_window('LRU')
+    
+    def open_clock_window(self):
+        self.open_simulation_window('CLOCK')
+    
+    def open_arc_window(self):
+        self.open_simulation_window('ARC')
+    
+    def open_two_queue_window(self):
+        self.open_simulation_window('2Q')
+    
+    def open_lfu_window(self):
+        self.open_simulation_window('LFU')
+    
+    def open_simulation_window(self, policy):
+        sim_window = tk.Toplevel(self.root)
+        sim_window.title(f"{policy} Page Replacement Simulation")
+        sim_window.geometry("900x700")
+        sim_window.configure(bg='#f0f0f0')
         
         # Test info header
-        self.create_test_info_header(lru_window)
+        self.create_test_info_header(sim_window)
         
         # Title
-        title_label = tk.Label(lru_window, text="LRU Page Replacement Simulation", 
-                              font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#FF9800')
+        title_label = tk.Label(sim_window, text=f"{policy} Page Replacement Simulation", 
+                              font=("Arial", 16, "bold"), bg='#f0f0f0', fg=POLICY_COLORS[policy])
         title_label.pack(pady=10)
         
-        # Run simulation
-        page_faults, hit_ratio, detailed_log = self.lru_page_replacement(
-            self.current_ref_string, self.current_frames)
+        reference_string = self.current_ref_string
+        frames = self.current_frames
         
-        # Results frame
-        results_frame = tk.LabelFrame(lru_window, text="Results", font=("Arial", 12, "bold"), 
-                                     bg='#f0f0f0', fg='#333', padx=10, pady=10)
-        results_frame.pack(pady=10, padx=20, fill='x')
+        def work(progress):
+            return self.simulate(policy, reference_string, frames, progress)
         
-        results_text = f"Total Page Faults: {page_faults}\nHit Ratio: {hit_ratio:.2f}%\nTotal References: {len(self.current_ref_string)}"
-        tk.Label(results_frame, text=results_text, font=("Arial", 11), bg='#f0f0f0', 
-                justify='left').pack(anchor='w')
-        
-        # Detailed log
-        log_frame = tk.LabelFrame(lru_window, text="Detailed Simulation Log", 
-                                 font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        log_frame.pack(pady=10, padx=20, fill='both', expand=True)
-        
-        # Create treeview for log
-        columns = ('Step', 'Page', 'Action', 'Frames', 'Replaced')
-        tree = ttk.Treeview(log_frame, columns=columns, show='headings', height=15)
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=100, anchor='center')
-        
-        # Populate treeview
-        for entry in detailed_log:
-            replaced = entry['replaced'] if entry['replaced'] else '-'
-            tree.insert('', tk.END, values=(
-                entry['step'], entry['page'], entry['action'], 
-                str(entry['frames']), replaced
-            ))
-        
-        # Scrollbar for treeview
-        scrollbar = ttk.Scrollbar(log_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Back button
-        back_btn = tk.Button(lru_window, text="Back to Main", 
-                            command=lru_window.destroy, bg='#607D8B', fg='white',
-                            font=("Arial", 10, "bold"))
-        back_btn.pack(pady=10)
+        def show_results(result):
+            page_faults, hit_ratio, detailed_log = result
+            
+            # Results frame
+            results_frame = tk.LabelFrame(sim_window, text="Results", font=("Arial", 12, "bold"), 
+                                         bg='#f0f0f0', fg='#333', padx=10, pady=10)
+            results_frame.pack(pady=10, padx=20, fill='x')
+            
+            results_text = f"Total Page Faults: {page_faults}\nHit Ratio: {hit_ratio:.2f}%\nTotal References: {len(reference_string)}"
+            tk.Label(results_frame, text=results_text, font=("Arial", 11), bg='#f0f0f0', 
+                    justify='left').pack(anchor='w')
+            
+            # Detailed log
+            log_frame = tk.LabelFrame(sim_window, text="Detailed Simulation Log", 
+                                     font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            log_frame.pack(pady=10, padx=20, fill='both', expand=True)
+            
+            # Virtual treeview: only rows in view are built from the log
+            columns = ('Step', 'Page', 'Action', 'Frames', 'Replaced')
+            log_view = VirtualLogView(log_frame, columns, len(detailed_log),
+                                      lambda index: log_row(detailed_log[index]), bg='#f0f0f0')
+            log_view.pack(fill='both', expand=True)
+            
+            # Back button
+            back_btn = tk.Button(sim_window, text="Back to Main", 
+                                command=sim_window.destroy, bg='#607D8B', fg='white',
+                                font=("Arial", 10, "bold"))
+            back_btn.pack(pady=10)
+        
+        # Run simulation off the main thread
+        self.run_in_background(sim_window, work, len(reference_string), show_results)
     
     def open_comparison_window(self):
+        compared = self.selected_policies
         comp_window = tk.Toplevel(self.root)
-        comp_window.title("FIFO vs LRU Comparison")
-        comp_window.geometry("1200x700")
+        comp_window.title(f"{' vs '.join(compared)} Comparison")
+        comp_window.geometry("1300x750")
         comp_window.configure(bg='#f0f0f0')
         
         # Test info header
         self.create_test_info_header(comp_window)
         
         # Title
-        title_label = tk.Label(comp_window, text="FIFO vs LRU Comparison Results", 
+        title_label = tk.Label(comp_window, text=f"{' vs '.join(compared)} Comparison Results", 
                               font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#9C27B0')
         title_label.pack(pady=10)
         
-        # Run both algorithms
-        start_time = time.time()
-        fifo_faults, fifo_hit_ratio, fifo_log = self.fifo_page_replacement(
-            self.current_ref_string, self.current_frames)
-        fifo_time = time.time() - start_time
-        
-        start_time = time.time()
-        lru_faults, lru_hit_ratio, lru_log = self.lru_page_replacement(
-            self.current_ref_string, self.current_frames)
-        lru_time = time.time() - start_time
-        
-        # Create main content frame with two columns
-        main_frame = tk.Frame(comp_window, bg='#f0f0f0')
-        main_frame.pack(pady=10, padx=20, fill='both', expand=True)
-        
-        # Left column for results and analysis
-        left_frame = tk.Frame(main_frame, bg='#f0f0f0')
-        left_frame.pack(side='left', fill='both', expand=False, padx=(0, 10))
-        
-        # Right column for side-by-side comparison
-        right_frame = tk.Frame(main_frame, bg='#f0f0f0')
-        right_frame.pack(side='right', fill='both', expand=True, padx=(10, 0))
-        
-        # Results frame (in left column)
-        results_frame = tk.LabelFrame(left_frame, text="Comparison Results", 
-                                     font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        results_frame.pack(pady=5, fill='x')
-        
-        # Create comparison table
-        comparison_text = f"""FIFO Algorithm:
-  • Page Faults: {fifo_faults}
-  • Hit Ratio: {fifo_hit_ratio:.2f}%
-  • Execution Time: {fifo_time:.6f} seconds
-
-LRU Algorithm:
-  • Page Faults: {lru_faults}
-  • Hit Ratio: {lru_hit_ratio:.2f}%
-  • Execution Time: {lru_time:.6f} seconds"""
-        
-        tk.Label(results_frame, text=comparison_text, font=("Arial", 10), 
-                bg='#f0f0f0', justify='left').pack(anchor='w', padx=10, pady=10)
-        
-        # Analysis frame (in left column)
-        analysis_frame = tk.LabelFrame(left_frame, text="Performance Analysis", 
-                                      font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        analysis_frame.pack(pady=5, fill='x')
-        
-        # Determine winner
-        if fifo_faults < lru_faults:
-            winner = "FIFO"
-            difference = lru_faults - fifo_faults
-            color = '#2196F3'
-        elif lru_faults < fifo_faults:
-            winner = "LRU"
-            difference = fifo_faults - lru_faults
-            color = '#FF9800'
-        else:
-            winner = "TIE"
-            difference = 0
-            color = '#4CAF50'
-        
-        if winner == "TIE":
-            analysis_text = "Both algorithms performed equally well!\n\nWhy equal performance?\n"
-            # Analyze why they're equal
-            if self.current_frames >= len(set(self.current_ref_string)):
-                analysis_text += "• Enough frames for all unique pages\n• No page replacement needed"
-            elif self.current_frames == 1:
-                analysis_text += "• Only 1 frame available\n• Both algorithms behave identically"
-            elif self.current_frames == 2:
-                analysis_text += "• With 2 frames, patterns may not\n  reveal algorithm differences"
+        reference_string = self.current_ref_string
+        frames = self.current_frames
+        total_references = len(reference_string)
+        policies = compared + ('OPT',)
+        diagnostics = self.diagnostics.get()
+        
+        def work(progress):
+            # Policies not in the result cache run in lockstep, in one pass over the references
+            fingerprint = self.fingerprint(reference_string)
+            runs = {}
+            metrics = {} if diagnostics else None
+            for policy in policies:
+                result = self.result_cache.get((fingerprint, frames, policy))
+                if result is not None:
+                    runs[policy] = result
+                if diagnostics and policy in compared:
+                    policy_metrics = self.result_cache.get((fingerprint, frames, policy, 'METRICS'))
+                    if policy_metrics is not None:
+                        metrics[policy] = policy_metrics
+            # Diagnostics are collected by instrumenting the lockstep pass, so a
+            # cached run without them is simulated again
+            missing = tuple(policy for policy in policies
+                            if policy not in runs or (diagnostics and policy in compared and policy not in metrics))
+            if missing:
+                fresh_metrics = {policy: PolicyMetrics() for policy in missing if policy in compared} if diagnostics else None
+                fresh, _ = lockstep_page_replacement(reference_string, frames, missing, progress=progress,
+                                                     metrics=fresh_metrics)
+                for policy, result in fresh.items():
+                    self.result_cache.put((fingerprint, frames, policy), result)
+                runs.update(fresh)
+                for policy, policy_metrics in (fresh_metrics or {}).items():
+                    self.result_cache.put((fingerprint, frames, policy, 'METRICS'), policy_metrics)
+                    metrics[policy] = policy_metrics
+            
+            # Steps where some compared policies hit and others fault
+            actions = [runs[policy][2].actions for policy in compared]
+            divergent = sum(1 for step in zip(*actions) if HIT in step and any(step))
+            # The trace analysis is a second pass, shown on the second half of the bar
+            trace_analysis = self.trace_analysis(reference_string,
+                                                 lambda done: progress(total_references + done))
+            return runs, divergent, metrics, trace_analysis
+        
+        def show_results(outcome):
+            runs, divergent, metrics, trace_analysis = outcome
+            # Create main content frame with two columns
+            main_frame = tk.Frame(comp_window, bg='#f0f0f0')
+            main_frame.pack(pady=10, padx=20, fill='both', expand=True)
+            
+            # Left column for results and analysis
+            left_frame = tk.Frame(main_frame, bg='#f0f0f0')
+            left_frame.pack(side='left', fill='both', expand=False, padx=(0, 10))
+            
+            # Right column for side-by-side comparison
+            right_frame = tk.Frame(main_frame, bg='#f0f0f0')
+            right_frame.pack(side='right', fill='both', expand=True, padx=(10, 0))
+            
+            # Results frame (in left column)
+            results_frame = tk.LabelFrame(left_frame, text="Comparison Results", 
+                                         font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            results_frame.pack(pady=5, fill='x')
+            
+            # Create comparison table
+            faults = {policy: runs[policy][0] for policy in compared}
+            opt_faults, opt_hit_ratio = runs['OPT'][0], runs['OPT'][1]
+            comparison_text = ""
+            for policy in compared:
+                page_faults, hit_ratio, _, elapsed = runs[policy]
+                comparison_text += (f"{policy} Algorithm:\n"
+                                    f"  • Page Faults: {page_faults}\n"
+                                    f"  • Hit Ratio: {hit_ratio:.2f}%\n"
+                                    f"  • Execution Time: {elapsed:.6f} seconds\n\n")
+            above_optimal = ", ".join(f"{policy} +{faults[policy] - opt_faults}" for policy in compared)
+            comparison_text += (f"OPT (optimal baseline):\n"
+                                f"  • Page Faults: {opt_faults}\n"
+                                f"  • Hit Ratio: {opt_hit_ratio:.2f}%\n"
+                                f"  • Faults above optimal: {above_optimal}\n\n"
+                                f"Steps where policies disagree: {divergent} of {total_references}")
+            
+            tk.Label(results_frame, text=comparison_text, font=("Arial", 10), 
+                    bg='#f0f0f0', justify='left').pack(anchor='w', padx=10, pady=10)
+            
+            # Analysis frame (in left column)
+            analysis_frame = tk.LabelFrame(left_frame, text="Performance Analysis", 
+                                          font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            analysis_frame.pack(pady=5, fill='x')
+            
+            # Determine winner
+            winner, difference = pick_winner(faults)
+            color = POLICY_COLORS.get(winner, '#4CAF50')
+            
+            if winner == "TIE":
+                analysis_text = "Best algorithms performed equally well!\n\nWhy equal performance?\n"
+                # Analyze why they're equal
+                if frames >= trace_analysis.distinct_pages:
+                    analysis_text += "• Enough frames for all unique pages\n• No page replacement needed"
+                elif frames == 1:
+                    analysis_text += "• Only 1 frame available\n• Both algorithms behave identically"
+                elif frames == 2:
+                    analysis_text += "• With 2 frames, patterns may not\n  reveal algorithm differences"
+                else:
+                    analysis_text += "• Reference pattern doesn't favor\n  either algorithm significantly"
+            else:
+                improvement = (difference / (faults[winner] + difference)) * 100
+                analysis_text = f"Winner: {winner}\nBy {difference} fewer page faults\nPerformance improvement: {improvement:.2f}%\n\n"
+            
+                # Explain why there's a difference
+                if winner == "LRU":
+                    analysis_text += "LRU wins because:\n• It considers recency of use\n• Better for patterns with locality"
+                elif winner == "CLOCK":
+                    analysis_text += "CLOCK wins because:\n• Reference bits give recently used\n  pages a second chance\n• Cheap approximation of recency"
+                elif winner == "ARC":
+                    analysis_text += "ARC wins because:\n• It balances recency and frequency\n• Ghost lists adapt the balance\n  to the pattern"
+                elif winner == "2Q":
+                    analysis_text += "2Q wins because:\n• Pages must be re-referenced to\n  reach the main queue\n• One-off pages cannot flush it"
+                elif winner == "LFU":
+                    analysis_text += "LFU wins because:\n• It keeps the most used pages\n• Good for stable hot sets"
+                else:
+                    analysis_text += "FIFO wins because:\n• Simple replacement strategy works\n• Less overhead in this case"
+            
+            # Add frame analysis, from the trace's reuse distances
+            unique_pages = trace_analysis.distinct_pages
+            analysis_text += f"\n\nFrame Analysis:\n• Unique pages: {unique_pages}\n• Available frames: {frames}"
+            
+            if frames >= unique_pages:
+                analysis_text += "\n• No replacement needed after initial loading"
+            elif frames == 1:
+                analysis_text += "\n• Algorithms behave identically with 1 frame"
             else:
-                analysis_text += "• Reference pattern doesn't favor\n  either algorithm significantly"
-        else:
-            improvement = (difference / max(fifo_faults, lru_faults)) * 100
-            analysis_text = f"Winner: {winner}\nBy {difference} fewer page faults\nPerformance improvement: {improvement:.2f}%\n\n"
-            
-            # Explain why there's a difference
-            if winner == "LRU":
-                analysis_text += "LRU wins because:\n• It considers recency of use\n• Better for patterns with locality"
+                analysis_text += (f"\n• Page replacement will occur\n"
+                                  f"• Reuses within {frames} frames: {trace_analysis.lru_hit_ratio(frames):.1f}%\n"
+                                  f"• Every reuse fits in {trace_analysis.frames_for_all_reuses()} frames")
+            
+            analysis_label = tk.Label(analysis_frame, text=analysis_text, font=("Arial", 9), 
+                                     bg='#f0f0f0', fg=color, justify='left')
+            analysis_label.pack(pady=10, anchor='w', padx=10)
+            
+            # Diagnostics frame (in left column)
+            diagnostics_frame = tk.LabelFrame(left_frame, text="Diagnostics", 
+                                             font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            diagnostics_frame.pack(pady=5, fill='x')
+            
+            if metrics is None:
+                diagnostics_text = "Tick \"Collect diagnostics in comparisons\" on the main window\nand open the comparison again to see why each policy faults."
             else:
-                analysis_text += "FIFO wins because:\n• Simple replacement strategy works\n• Less overhead in this case"
-        
-        # Add frame analysis
-        unique_pages = len(set(self.current_ref_string))
-        analysis_text += f"\n\nFrame Analysis:\n• Unique pages: {unique_pages}\n• Available frames: {self.current_frames}"
-        
-        if self.current_frames >= unique_pages:
-            analysis_text += "\n• No replacement needed after initial loading"
-        elif self.current_frames == 1:
-            analysis_text += "\n• Algorithms behave identically with 1 frame"
-        else:
-            analysis_text += f"\n• Page replacement will occur\n• Algorithms may differ with {self.current_frames} frames"
-        
-        analysis_label = tk.Label(analysis_frame, text=analysis_text, font=("Arial", 9), 
-                                 bg='#f0f0f0', fg=color, justify='left')
-        analysis_label.pack(pady=10, anchor='w', padx=10)
-        
-        # Detailed comparison table (in right column)
-        detail_frame = tk.LabelFrame(right_frame, text="Side-by-Side Comparison", 
-                                    font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        detail_frame.pack(fill='both', expand=True)
-        
-        # Create comparison treeview
-        columns = ('Step', 'Page', 'FIFO Action', 'FIFO Frames', 'LRU Action', 'LRU Frames')
-        tree = ttk.Treeview(detail_frame, columns=columns, show='headings', height=20)
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=90, anchor='center')
-        
-        # Populate comparison
-        for i in range(len(fifo_log)):
-            tree.insert('', tk.END, values=(
-                fifo_log[i]['step'], fifo_log[i]['page'],
-                fifo_log[i]['action'], str(fifo_log[i]['frames']),
-                lru_log[i]['action'], str(lru_log[i]['frames'])
-            ))
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(detail_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Back button
-        back_btn = tk.Button(comp_window, text="Back to Main", 
-                            command=comp_window.destroy, bg='#607D8B', fg='white',
-                            font=("Arial", 10, "bold"))
-        back_btn.pack(pady=10)
+                diagnostics_text = "\n\n".join(f"{policy}:\n{metrics[policy].summary()}" for policy in compared)
+            tk.Label(diagnostics_frame, text=diagnostics_text, font=("Arial", 9), 
+                    bg='#f0f0f0', justify='left').pack(anchor='w', padx=10, pady=10)
+            
+            def export_metrics():
+                path = filedialog.asksaveasfilename(parent=comp_window, defaultextension=".json", 
+                                                    filetypes=[("JSON", "*.json")])
+                if path:
+                    try:
+                        write_metrics_json(metrics, path, trace=self.fingerprint(reference_string), frames=frames)
+                    except OSError as error:
+                        messagebox.showerror("Error", f"Could not write metrics: {error}")
+            
+            if metrics is not None:
+                tk.Button(diagnostics_frame, text="Export Metrics (JSON)", command=export_metrics, 
+                         bg='#607D8B', fg='white', font=("Arial", 9, "bold")).pack(anchor='w', padx=10, pady=(0, 10))
+            
+            # Reuse distances, working sets and phases of the trace (in right column)
+            trace_frame = tk.LabelFrame(right_frame, text="Trace Analysis", 
+                                       font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            trace_frame.pack(fill='x', pady=(0, 5))
+            tk.Label(trace_frame, text=trace_analysis.summary(), font=("Arial", 9), 
+                    bg='#f0f0f0', justify='left').pack(anchor='w', padx=10, pady=5)
+            
+            # Detailed comparison table (in right column)
+            detail_frame = tk.LabelFrame(right_frame, text="Side-by-Side Comparison", 
+                                        font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            detail_frame.pack(fill='both', expand=True)
+            
+            # Virtual comparison treeview
+            columns = ('Step', 'Page')
+            for policy in policies:
+                columns += (f"{policy} Action", f"{policy} Frames")
+            columns += ('Divergence',)
+            logs = [runs[policy][2] for policy in policies]
+            
+            def comparison_row(index):
+                entries = [log[index] for log in logs]
+                row = (entries[0]['step'], entries[0]['page'])
+                for entry in entries:
+                    row += (entry['action'], str(entry['frames']))
+                hits = [entry['action'] == 'Hit' for entry in entries[:len(compared)]]
+                return row + (describe_step(hits, compared) or '',)
+            
+            log_view = VirtualLogView(detail_frame, columns, len(logs[0]), comparison_row,
+                                      column_width=70, height=12, bg='#f0f0f0')
+            log_view.pack(fill='both', expand=True)
+            
+            # Back button
+            back_btn = tk.Button(comp_window, text="Back to Main", 
+                                command=comp_window.destroy, bg='#607D8B', fg='white',
+                                font=("Arial", 10, "bold"))
+            back_btn.pack(pady=10)
+        
+        # Run simulations off the main thread
+        self.run_in_background(comp_window, work, 2 * total_references, show_results)
     
     def open_analysis_window(self):
         analysis_window = tk.Toplevel(self.root)
@@ -498,90 +591,184 @@ LRU Algorithm:
             }
         ]
         
-        # Results frame with scrolled text
-        results_frame = tk.LabelFrame(analysis_window, text="Analysis Results", 
-                                     font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
-        results_frame.pack(pady=10, padx=20, fill='both', expand=True)
-        
-        text_widget = scrolledtext.ScrolledText(results_frame, width=100, height=25, 
-                                               font=("Courier", 10), bg='white')
-        text_widget.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Run analysis and display results
-        all_results = []
-        
-        text_widget.insert(tk.END, "COMPREHENSIVE PAGE REPLACEMENT ALGORITHM ANALYSIS\n")
-        text_widget.insert(tk.END, "=" * 80 + "\n\n")
-        
-        for scenario in test_scenarios:
-            for frame_size in scenario['frames']:
-                # Run both algorithms
-                fifo_faults, fifo_hit_ratio, _ = self.fifo_page_replacement(
-                    scenario['reference_string'], frame_size)
-                lru_faults, lru_hit_ratio, _ = self.lru_page_replacement(
-                    scenario['reference_string'], frame_size)
-                
-                # Determine winner
-                if fifo_faults < lru_faults:
-                    winner = "FIFO"
-                    difference = lru_faults - fifo_faults
-                elif lru_faults < fifo_faults:
-                    winner = "LRU"
-                    difference = fifo_faults - lru_faults
-                else:
-                    winner = "TIE"
-                    difference = 0
-                
-                result = {
-                    'test_name': f"{scenario['name']} - {frame_size} frames",
-                    'fifo_faults': fifo_faults,
-                    'fifo_hit_ratio': fifo_hit_ratio,
-                    'lru_faults': lru_faults,
-                    'lru_hit_ratio': lru_hit_ratio,
-                    'winner': winner,
-                    'difference': difference
-                }
-                all_results.append(result)
-                
-                # Display individual test result
+        policies = self.selected_policies
+        sweep_jobs = len(build_jobs(test_scenarios, policies))
+        # Each scenario's trace analysis counts as one more job
+        total_jobs = sweep_jobs + len(test_scenarios)
+        
+        def work(progress):
+            # Scenario, frame size and policy jobs are spread over a process pool
+            def sweep():
+                # Spawned, not forked: Tk and the worker thread are running
+                table = run_sweep(test_scenarios, policies, progress=progress,
+                                  mp_context=multiprocessing.get_context('spawn'))
+                return compare_results(test_scenarios, table, policies)
+            current = test_scenarios[0]
+            key = (self.fingerprint(current['reference_string']), current['frames'][0], ('ANALYSIS',) + policies)
+            all_results = self.result_cache.get_or_compute(key, sweep)
+            trace_analyses = []
+            for done, scenario in enumerate(test_scenarios, sweep_jobs + 1):
+                # Reporting the jobs done so far lets Cancel stop a long analysis
+                trace_analyses.append(self.trace_analysis(scenario['reference_string'],
+                                                          lambda references: progress(done - 1)))
+                progress(done)
+            return all_results, trace_analyses
+        
+        def show_results(outcome):
+            all_results, trace_analyses = outcome
+            # Results frame with scrolled text
+            results_frame = tk.LabelFrame(analysis_window, text="Analysis Results", 
+                                         font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333')
+            results_frame.pack(pady=10, padx=20, fill='both', expand=True)
+            
+            text_widget = scrolledtext.ScrolledText(results_frame, width=100, height=25, 
+                                                   font=("Courier", 10), bg='white')
+            text_widget.pack(fill='both', expand=True, padx=10, pady=10)
+            
+            text_widget.insert(tk.END, "COMPREHENSIVE PAGE REPLACEMENT ALGORITHM ANALYSIS\n")
+            text_widget.insert(tk.END, "=" * 80 + "\n\n")
+            
+            # Display individual test results
+            for result in all_results:
                 text_widget.insert(tk.END, f"TEST: {result['test_name']}\n")
-                text_widget.insert(tk.END, f"Reference String: {scenario['reference_string']}\n")
-                text_widget.insert(tk.END, f"Frames: {frame_size}\n")
-                text_widget.insert(tk.END, f"FIFO - Faults: {fifo_faults}, Hit Ratio: {fifo_hit_ratio:.2f}%\n")
-                text_widget.insert(tk.END, f"LRU  - Faults: {lru_faults}, Hit Ratio: {lru_hit_ratio:.2f}%\n")
-                text_widget.insert(tk.END, f"Winner: {winner}")
-                if difference > 0:
-                    text_widget.insert(tk.END, f" (by {difference} faults)")
+                text_widget.insert(tk.END, f"Reference String: {format_reference_string(result['reference_string'])}\n")
+                text_widget.insert(tk.END, f"Frames: {result['frames']}\n")
+                for policy in policies:
+                    key = result_key(policy)
+                    text_widget.insert(tk.END, f"{policy:<5} - Faults: {result[f'{key}_faults']}, Hit Ratio: {result[f'{key}_hit_ratio']:.2f}%\n")
+                text_widget.insert(tk.END, f"Winner: {result['winner']}")
+                if result['difference'] > 0:
+                    text_widget.insert(tk.END, f" (by {result['difference']} faults)")
                 text_widget.insert(tk.END, "\n" + "-" * 60 + "\n\n")
-        
-        # Summary analysis
-        text_widget.insert(tk.END, "\nSUMMARY ANALYSIS\n")
-        text_widget.insert(tk.END, "=" * 50 + "\n")
-        
-        fifo_wins = sum(1 for r in all_results if r['winner'] == 'FIFO')
-        lru_wins = sum(1 for r in all_results if r['winner'] == 'LRU')
-        ties = sum(1 for r in all_results if r['winner'] == 'TIE')
-        
-        text_widget.insert(tk.END, f"Total Tests: {len(all_results)}\n")
-        text_widget.insert(tk.END, f"FIFO Wins: {fifo_wins}\n")
-        text_widget.insert(tk.END, f"LRU Wins: {lru_wins}\n")
-        text_widget.insert(tk.END, f"Ties: {ties}\n\n")
-        
-        # Average performance
-        avg_fifo_faults = sum(r['fifo_faults'] for r in all_results) / len(all_results)
-        avg_lru_faults = sum(r['lru_faults'] for r in all_results) / len(all_results)
-        avg_fifo_hit_ratio = sum(r['fifo_hit_ratio'] for r in all_results) / len(all_results)
-        avg_lru_hit_ratio = sum(r['lru_hit_ratio'] for r in all_results) / len(all_results)
-        
-        text_widget.insert(tk.END, "Average Performance:\n")
-        text_widget.insert(tk.END, f"FIFO - Avg Faults: {avg_fifo_faults:.2f}, Avg Hit Ratio: {avg_fifo_hit_ratio:.2f}%\n")
-        text_widget.insert(tk.END, f"LRU  - Avg Faults: {avg_lru_faults:.2f}, Avg Hit Ratio: {avg_lru_hit_ratio:.2f}%\n")
-        
-        # Back button
-        back_btn = tk.Button(analysis_window, text="Back to Main", 
-                            command=analysis_window.destroy, bg='#607D8B', fg='white',
-                            font=("Arial", 10, "bold"))
-        back_btn.pack(pady=10)
+            
+            # Summary analysis
+            text_widget.insert(tk.END, "\nSUMMARY ANALYSIS\n")
+            text_widget.insert(tk.END, "=" * 50 + "\n")
+            
+            summary = summarize(all_results, policies)
+            
+            text_widget.insert(tk.END, f"Total Tests: {summary['total']}\n")
+            for policy in policies:
+                text_widget.insert(tk.END, f"{policy} Wins: {summary['wins'][policy]}\n")
+            text_widget.insert(tk.END, f"Ties: {summary['ties']}\n\n")
+            
+            text_widget.insert(tk.END, "Average Performance:\n")
+            for policy in policies:
+                text_widget.insert(tk.END, f"{policy:<5} - Avg Faults: {summary['avg_faults'][policy]:.2f}, "
+                                           f"Avg Hit Ratio: {summary['avg_hit_ratio'][policy]:.2f}%\n")
+            
+            # What each scenario's trace asks of memory, to choose frame counts from
+            text_widget.insert(tk.END, "\nTRACE ANALYSIS\n")
+            text_widget.insert(tk.END, "=" * 50 + "\n")
+            for scenario, trace_analysis in zip(test_scenarios, trace_analyses):
+                text_widget.insert(tk.END, f"{scenario['name']}:\n{trace_analysis.summary()}\n\n")
+            
+            # Back button
+            back_btn = tk.Button(analysis_window, text="Back to Main", 
+                                command=analysis_window.destroy, bg='#607D8B', fg='white',
+                                font=("Arial", 10, "bold"))
+            back_btn.pack(pady=10)
+        
+        # Run analysis off the main thread
+        self.run_in_background(analysis_window, work, total_jobs, show_results)
+    
+    def run_in_background(self, window, work, total, on_done):
+        """
+        Run work(progress) on a worker thread while window shows a
+        progress bar and a Cancel button. on_done(result) builds the
+        results on the main thread; closing the window cancels the run.
+        """
+        progress_frame = tk.Frame(window, bg='#f0f0f0')
+        progress_frame.pack(pady=20, padx=20, fill='x')
+        
+        status_label = tk.Label(progress_frame, text="Running simulation...", 
+                               font=("Arial", 10), bg='#f0f0f0')
+        status_label.pack(anchor='w')
+        
+        progress_bar = ttk.Progressbar(progress_frame, orient='horizontal', mode='determinate', 
+                                       maximum=max(total, 1))
+        progress_bar.pack(fill='x', pady=5)
+        
+        profiler = self.new_profiler()
+        if profiler is not None:
+            unprofiled_work, unprofiled_done = work, on_done
+            
+            def work(progress):
+                # Runs on the worker thread, which is the one profiled
+                with profiler.phase('simulate'):
+                    return unprofiled_work(progress)
+            
+            def on_done(result):
+                with profiler, profiler.phase('render'):
+                    unprofiled_done(result)
+                self.show_profile(profiler)
+        
+        task = SimulationTask(work)
+        
+        def abandon():
+            if task.cancelled.is_set():
+                return
+            task.cancel()
+            if profiler is not None:
+                # The worker's phase is still being profiled until it sees the
+                # cancellation, so finish once the thread has ended
+                threading.Thread(target=lambda: (task.thread.join(), profiler.finish()),
+                                 daemon=True).start()
+        
+        def cancel():
+            abandon()
+            window.destroy()
+        
+        cancel_btn = tk.Button(progress_frame, text="Cancel", command=cancel, 
+                              bg='#607D8B', fg='white', font=("Arial", 10, "bold"))
+        cancel_btn.pack(pady=5)
+        window.protocol("WM_DELETE_WINDOW", cancel)
+        
+        # Polled from the root: callbacks scheduled on window die with it,
+        # and a window closed by other means (create_main_window destroys
+        # every Toplevel) must still stop the run
+        def poll():
+            if not window.winfo_exists():
+                abandon()
+                return
+            for kind, value in task.poll():
+                if kind == 'progress':
+                    progress_bar['value'] = value
+                    status_label.config(text=f"Running simulation... {value} / {total}")
+                elif kind == 'done':
+                    progress_frame.destroy()
+                    window.protocol("WM_DELETE_WINDOW", window.destroy)
+                    on_done(value)
+                    return
+                elif kind == 'error':
+                    window.destroy()
+                    if profiler is not None:
+                        profiler.finish()
+                    messagebox.showerror("Error", f"Simulation failed: {value}")
+                    return
+                elif kind == 'cancelled':
+                    return
+            self.root.after(50, poll)
+        
+        task.start()
+        self.root.after(50, poll)
+    
+    def new_profiler(self):
+        """
+        Profiler for the next run, or None when profiling is off
+        """
+        if not self.profiling.get():
+            return None
+        try:
+            return Profiler(time.strftime("profile_%Y%m%d_%H%M%S"))
+        except RuntimeError as error:
+            messagebox.showwarning("Profile", f"{error}; this run is not profiled.")
+            return None
+    
+    def show_profile(self, profiler):
+        report = profiler.finish()
+        print(report)
+        messagebox.showinfo("Profile", report)
     
     def run(self):
         self.root.mainloop()
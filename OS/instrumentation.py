@@ -0,0 +1,155 @@
+import json
+
+from simulationLog import HIT, FAULT_REPLACED, run_accesses
+
+# Pages listed as the most re-faulted in metric reports
+TOP_PAGES = 10
+
+def _bucket_label(bucket):
+    # Power-of-two bucket b holds 2**(b-1) .. 2**b - 1
+    if bucket == 0:
+        return "0"
+    low, high = 1 << (bucket - 1), (1 << bucket) - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+class Histogram:
+    """
+    Counts of step distances in power-of-two buckets, plus their sum
+    for the mean
+    """
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        bucket = value.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'buckets': {_bucket_label(bucket): self.buckets[bucket] for bucket in sorted(self.buckets)}
+        }
+
+class PolicyMetrics:
+    """
+    Why a policy faults, collected one reference at a time by observe()
+    (time is the reference index):
+    - residency time: steps from a page's load to its eviction;
+    - eviction age: steps since the evicted page was last used;
+    - re-fault distance: steps from a page's eviction to its next fault;
+    - cold misses (first reference to a page) vs capacity misses
+      (a page that was evicted earlier), and the most re-faulted pages.
+    Short re-fault distances on many capacity misses mean thrashing.
+    """
+    def __init__(self):
+        self.time = 0
+        self.loaded_at = {}
+        self.last_use = {}
+        self.evicted_at = {}
+        self.refaults = {}  # page -> capacity misses
+        self.cold_misses = 0
+        self.capacity_misses = 0
+        self.residency_time = Histogram()
+        self.eviction_age = Histogram()
+        self.refault_distance = Histogram()
+
+    def observe(self, page, hit, old_page):
+        now = self.time
+        self.time = now + 1
+        if not hit:
+            evicted = self.evicted_at.pop(page, None)
+            if evicted is None:
+                self.cold_misses += 1
+            else:
+                self.capacity_misses += 1
+                self.refault_distance.add(now - evicted)
+                self.refaults[page] = self.refaults.get(page, 0) + 1
+            self.loaded_at[page] = now
+            if old_page is not None:
+                self.residency_time.add(now - self.loaded_at.pop(old_page))
+                self.eviction_age.add(now - self.last_use[old_page])
+                self.evicted_at[old_page] = now
+        self.last_use[page] = now
+
+    def most_refaulted(self, count=TOP_PAGES):
+        return sorted(self.refaults.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+    def as_dict(self):
+        return {
+            'references': self.time,
+            'cold_misses': self.cold_misses,
+            'capacity_misses': self.capacity_misses,
+            'residency_time': self.residency_time.as_dict(),
+            'eviction_age': self.eviction_age.as_dict(),
+            'refault_distance': self.refault_distance.as_dict(),
+            'most_refaulted': [[page, count] for page, count in self.most_refaulted()]
+        }
+
+    def summary(self):
+        """
+        A few lines for the console and GUI reports
+        """
+        pages = ", ".join(f"{page} (x{count})" for page, count in self.most_refaulted(5)) or "none"
+        return (f"Cold misses: {self.cold_misses}, capacity misses: {self.capacity_misses}\n"
+                f"Mean residency: {self.residency_time.mean():.1f} steps, "
+                f"mean eviction age: {self.eviction_age.mean():.1f} steps\n"
+                f"Mean re-fault distance: {self.refault_distance.mean():.1f} steps\n"
+                f"Most re-faulted pages: {pages}")
+
+class InstrumentedEngine:
+    """
+    Wraps a policy engine, passing every access to metrics.observe.
+    Uninstrumented runs use the bare engine, so instrumentation costs
+    nothing unless asked for.
+    """
+    def __init__(self, engine, metrics=None):
+        self.engine = engine
+        self.metrics = metrics if metrics is not None else PolicyMetrics()
+
+    def access(self, page):
+        hit, old_page = self.engine.access(page)
+        self.metrics.observe(page, hit, old_page)
+        return hit, old_page
+
+    def run(self, reference_string):
+        return run_accesses(self, reference_string)
+
+    def frames(self):
+        return self.engine.frames()
+
+    @property
+    def hits(self):
+        return self.engine.hits
+
+    @property
+    def page_faults(self):
+        return self.engine.page_faults
+
+def metrics_from_log(detailed_log):
+    """
+    PolicyMetrics rebuilt from a SimulationLog's columns, for runs that
+    kept a log anyway
+    """
+    metrics = PolicyMetrics()
+    observe = metrics.observe
+    for page, action, replaced in zip(detailed_log.pages, detailed_log.actions, detailed_log.replaced):
+        observe(page, action == HIT, replaced if action == FAULT_REPLACED else None)
+    return metrics
+
+def write_metrics_json(metrics, path, **info):
+    """
+    Write {policy: PolicyMetrics} as JSON, with info (e.g. frames) at
+    the top level
+    """
+    report = dict(info)
+    report['policies'] = {policy: policy_metrics.as_dict() for policy, policy_metrics in metrics.items()}
+    with open(path, "w") as output:
+        json.dump(report, output, indent=2)
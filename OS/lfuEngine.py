@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+from simulationLog import SimulationLog, simulate, run_accesses
+
+class LFUEngine:
+    """
+    LFU page replacement with O(1) hit, miss and evict. Pages sit in
+    per-frequency buckets (OrderedDicts, least recently used first)
+    and the smallest non-empty frequency is tracked, so the victim is
+    always the first page of the min_frequency bucket; ties between
+    equally frequent pages go to the least recently used.
+    """
+    def __init__(self, frames):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.frequency = {}  # page -> reference count
+        self.buckets = {}  # reference count -> OrderedDict of pages
+        self.min_frequency = 0
+        self.resident = {}  # Resident pages in load order
+        self.page_faults = 0
+        self.hits = 0
+
+    def _bump(self, page):
+        count = self.frequency[page]
+        bucket = self.buckets[count]
+        del bucket[page]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        self.frequency[page] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[page] = None
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        if page in self.frequency:
+            self.hits += 1
+            self._bump(page)
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        if len(self.resident) == self.capacity:
+            # Page out the least frequently used page
+            bucket = self.buckets[self.min_frequency]
+            old_page = bucket.popitem(last=False)[0]
+            if not bucket:
+                del self.buckets[self.min_frequency]
+            del self.frequency[old_page]
+            del self.resident[old_page]
+        self.frequency[page] = 1
+        self.buckets.setdefault(1, OrderedDict())[page] = None
+        self.min_frequency = 1
+        self.resident[page] = None
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        return run_accesses(self, reference_string)
+
+    def frames(self):
+        """
+        Resident pages in load order
+        """
+        return list(self.resident)
+
+    def __contains__(self, page):
+        return page in self.resident
+
+    def __len__(self):
+        return len(self.resident)
+
+def lfu_page_replacement(reference_string, frames, verbose=False, progress=None):
+    """
+    Simulate LFU over reference_string. When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    """
+    engine = LFUEngine(frames)
+    detailed_log = SimulationLog()
+
+    if verbose:
+        print(f"\n--- LFU Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress)
@@ -0,0 +1,121 @@
+import time
+from itertools import islice
+
+from optEngine import OPTEngine
+from instrumentation import InstrumentedEngine
+from policies import ENGINES, LOG_OPTIONS, COMPARED_POLICIES
+from simulationLog import SimulationLog, PROGRESS_INTERVAL
+
+# Divergent steps kept with their page and description
+DIVERGENCE_EXAMPLES = 10
+# References each engine runs through at a time, so reading the clock
+# costs little next to the engines
+LOCKSTEP_BLOCK = 256
+
+def lockstep_page_replacement(reference_string, frames, policies=COMPARED_POLICIES, verbose=False,
+                              progress=None, log=True, metrics=None, compared=None,
+                              examples=DIVERGENCE_EXAMPLES):
+    """
+    Simulate several policies in a single pass: references are read
+    once, LOCKSTEP_BLOCK at a time, and each block is fed to each
+    policy's engine in turn, so a streamed trace is read once however
+    many policies run. 'OPT' may be included; it
+    needs the whole reference string, which is then read into a list
+    first if it is not already a sequence.
+    Returns (results, divergence). results maps each policy to
+    (page faults, hit ratio, log, seconds), the log being None when log
+    is off and seconds the time spent in that policy's engine.
+    divergence is counted during the pass, so memory stays constant
+    however long the trace: {'steps': steps where the compared
+    policies (a leading part of policies, default all) disagree,
+    'references': references read, 'examples': (step index, page,
+    description) of the first examples such steps}.
+    When given, progress(steps) is called every PROGRESS_INTERVAL
+    references. metrics optionally maps policies to PolicyMetrics to
+    fill as the run goes; only those policies pay for instrumentation.
+    """
+    if 'OPT' in policies and not hasattr(reference_string, '__getitem__'):
+        reference_string = list(reference_string)
+
+    engines = []
+    logs = []
+    for policy in policies:
+        if policy == 'OPT':
+            engines.append(OPTEngine(frames, reference_string))
+        else:
+            engines.append(ENGINES[policy](frames))
+        logs.append(SimulationLog(**LOG_OPTIONS.get(policy, {})) if log else None)
+    metrics = metrics or {}
+    lanes = [(InstrumentedEngine(engine, metrics[policy]).access if policy in metrics else engine.access,
+              detailed_log.record if log else None, engine.frames)
+             for policy, engine, detailed_log in zip(policies, engines, logs)]
+    elapsed = [0] * len(policies)
+    # Trailing lanes such as an OPT baseline can be left out of the comparison
+    compared = policies if compared is None else compared
+    full = (1 << len(compared)) - 1
+    divergent_steps = 0
+    divergent_examples = []
+    references = 0
+    clock = time.perf_counter_ns
+
+    if verbose:
+        print(f"\n--- {' / '.join(policies)} Lockstep Simulation (Frames: {frames}) ---")
+
+    pages = iter(reference_string)
+    # Verbose output shows every engine's frames after each step
+    block_size = 1 if verbose else LOCKSTEP_BLOCK
+    while True:
+        block = list(islice(pages, block_size))
+        if not block:
+            break
+        # Bit lane of masks[j] is set when that lane hit on block[j]
+        masks = [0] * len(block)
+        for lane, (access, record, frames_of) in enumerate(lanes):
+            bit = 1 << lane
+            started = clock()
+            if record is None:
+                for j, page in enumerate(block):
+                    if access(page)[0]:
+                        masks[j] |= bit
+            else:
+                for j, page in enumerate(block):
+                    hit, old_page = access(page)
+                    record(page, hit, old_page, frames_of)
+                    if hit:
+                        masks[j] |= bit
+            elapsed[lane] += clock() - started
+
+        for page, mask in zip(block, masks):
+            i = references
+            references += 1
+            agreement = mask & full
+            if agreement != 0 and agreement != full:
+                divergent_steps += 1
+                if len(divergent_examples) < examples:
+                    hits = [agreement >> lane & 1 for lane in range(len(compared))]
+                    divergent_examples.append((i, page, describe_step(hits, compared)))
+            if progress is not None and references % PROGRESS_INTERVAL == 0:
+                progress(references)
+
+            if verbose:
+                states = ", ".join(
+                    f"{policy} {'hit' if mask >> lane & 1 else 'fault'} {engine.frames()}"
+                    for lane, (policy, engine) in enumerate(zip(policies, engines)))
+                print(f"Step {i+1}: Page {page} -> {states}")
+
+    results = {}
+    for policy, engine, detailed_log, nanoseconds in zip(policies, engines, logs, elapsed):
+        total_references = engine.hits + engine.page_faults
+        hit_ratio = (engine.hits / total_references) * 100 if total_references > 0 else 0
+        results[policy] = (engine.page_faults, hit_ratio, detailed_log, nanoseconds / 1e9)
+    divergence = {'steps': divergent_steps, 'references': references, 'examples': divergent_examples}
+    return results, divergence
+
+def describe_step(hits, policies):
+    """
+    Text such as "FIFO fault, LRU hit" for one step, where hits[i]
+    tells whether policies[i] hit, or None when all policies agree
+    """
+    if all(hits) or not any(hits):
+        return None
+    return ", ".join(f"{policy} {'hit' if hit else 'fault'}" for policy, hit in zip(policies, hits))
@@ -0,0 +1,128 @@
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualLogView(tk.Frame):
+    """
+    Treeview over a simulation log that only holds the rows in the
+    viewport. Rows are fetched from get_row(index) as the view scrolls,
+    so opening a window costs the same whatever the trace length.
+    Includes a "Go to step" box for jumping straight to a step number.
+    """
+    def __init__(self, parent, columns, row_count, get_row, column_width=100, height=15, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_count = row_count
+        self.get_row = get_row
+        self.top = 0
+        self.visible = height
+        self.selected = None
+
+        # Jump to step
+        jump_frame = tk.Frame(self, bg=kwargs.get('bg', '#f0f0f0'))
+        jump_frame.pack(side='top', fill='x', pady=(0, 5))
+        tk.Label(jump_frame, text="Go to step:", bg=kwargs.get('bg', '#f0f0f0'),
+                font=("Arial", 9)).pack(side='left')
+        self.jump_entry = tk.Entry(jump_frame, width=10, font=("Arial", 9))
+        self.jump_entry.pack(side='left', padx=5)
+        self.jump_entry.bind('<Return>', lambda event: self.jump_from_entry())
+        tk.Button(jump_frame, text="Go", command=self.jump_from_entry,
+                 font=("Arial", 9)).pack(side='left')
+        tk.Label(jump_frame, text=f"{row_count} steps", bg=kwargs.get('bg', '#f0f0f0'),
+                font=("Arial", 9)).pack(side='right')
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height,
+                                 selectmode='none')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=column_width, anchor='center')
+        self.tree.tag_configure('selected', background='#BBDEFB')
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_to(self.top - 3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_to(self.top + 3))
+        self.tree.bind('<Up>', lambda event: self.scroll_to(self.top - 1))
+        self.tree.bind('<Down>', lambda event: self.scroll_to(self.top + 1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_to(self.top - self.visible))
+        self.tree.bind('<Next>', lambda event: self.scroll_to(self.top + self.visible))
+        self.tree.bind('<Button-1>', lambda event: self.tree.focus_set())
+
+        self.refresh()
+
+    def row_height(self):
+        height = ttk.Style().lookup('Treeview', 'rowheight')
+        try:
+            return max(int(height), 1)
+        except (TypeError, ValueError):
+            return 20
+
+    def on_resize(self, event):
+        # Heading takes about one row
+        visible = max(event.height // self.row_height() - 1, 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.top)
+
+    def on_mousewheel(self, event):
+        self.scroll_to(self.top - (3 if event.delta > 0 else -3))
+
+    def on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(int(float(args[0]) * self.row_count))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            step = self.visible if unit == 'pages' else 1
+            self.scroll_to(self.top + amount * step)
+
+    def scroll_to(self, top):
+        top = min(max(top, 0), max(self.row_count - self.visible, 0))
+        self.top = top
+        self.refresh()
+
+    def jump_to(self, step):
+        """
+        Scroll so the 1-based step is near the top and highlight it
+        """
+        index = min(max(step - 1, 0), max(self.row_count - 1, 0))
+        self.selected = index
+        self.scroll_to(index - 2)
+
+    def jump_from_entry(self):
+        try:
+            self.jump_to(int(self.jump_entry.get().strip()))
+        except ValueError:
+            self.jump_entry.delete(0, tk.END)
+
+    def refresh(self):
+        """
+        Rebuild the handful of rows in the viewport from get_row
+        """
+        tree = self.tree
+        end = min(self.top + self.visible, self.row_count)
+        items = tree.get_children()
+        wanted = end - self.top
+        if len(items) > wanted:
+            tree.delete(*items[wanted:])
+            items = items[:wanted]
+        for offset, index in enumerate(range(self.top, end)):
+            tags = ('selected',) if index == self.selected else ()
+            values = self.get_row(index)
+            if offset < len(items):
+                tree.item(items[offset], values=values, tags=tags)
+            else:
+                tree.insert('', tk.END, values=values, tags=tags)
+
+        if self.row_count > 0:
+            self.scrollbar.set(self.top / self.row_count, end / self.row_count)
+        else:
+            self.scrollbar.set(0, 1)
+
+def log_row(entry):
+    """
+    Treeview values for one simulation log entry
+    """
+    replaced = entry['replaced'] if entry['replaced'] is not None else '-'
+    return (entry['step'], entry['page'], entry['action'], str(entry['frames']), replaced)
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from simulationLog import SimulationLog, resume_run, simulate
+
+class LRUEngine:
+    """
+    LRU page replacement engine with O(1) hit, miss and evict.
+    Resident pages are kept in an OrderedDict ordered from least to
+    most recently used, like the one in lruSample.py.
+    """
+    def __init__(self, frames):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.memory = OrderedDict()
+        self.page_faults = 0
+        self.hits = 0
+
+    @classmethod
+    def from_state(cls, frames, resident, hits=0, page_faults=0):
+        """
+        Engine holding resident (least recently used first, as frames()
+        lists them) with the given counters, to resume a run from a
+        checkpoint
+        """
+        engine = cls(frames)
+        engine.memory = OrderedDict.fromkeys(resident)
+        engine.hits = hits
+        engine.page_faults = page_faults
+        return engine
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        memory = self.memory
+        if page in memory:
+            self.hits += 1
+            memory.move_to_end(page)
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        if len(memory) == self.capacity:
+            # Page out the least recently used (first entry)
+            old_page = memory.popitem(last=False)[0]
+        memory[page] = None
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        memory = self.memory
+        move_to_end = memory.move_to_end
+        popitem = memory.popitem
+        capacity = self.capacity
+        hits = 0
+        faults = 0
+        for page in reference_string:
+            if page in memory:
+                hits += 1
+                move_to_end(page)
+                continue
+            faults += 1
+            if len(memory) == capacity:
+                popitem(last=False)
+            memory[page] = None
+        self.hits += hits
+        self.page_faults += faults
+        return self.page_faults
+
+    def frames(self):
+        """
+        Resident pages from least to most recently used
+        """
+        return list(self.memory)
+
+    def __contains__(self, page):
+        return page in self.memory
+
+    def __len__(self):
+        return len(self.memory)
+
+def lru_page_replacement(reference_string, frames, verbose=False, progress=None, resume=None):
+    """
+    Simulate LRU over reference_string. When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    resume is (previous reference string, previous log) from a run with
+    the same frames; the run then restarts from the last checkpoint
+    before the first changed reference, with an identical result.
+    """
+    if resume is None:
+        start = 0
+        engine = LRUEngine(frames)
+        detailed_log = SimulationLog(touch_on_hit=True)
+    else:
+        start, detailed_log, resident, hits, page_faults = resume_run(*resume, reference_string)
+        engine = LRUEngine.from_state(frames, resident, hits, page_faults)
+
+    if verbose:
+        print(f"\n--- LRU Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress, start)
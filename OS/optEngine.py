@@ -0,0 +1,111 @@
+import heapq
+
+from simulationLog import SimulationLog, simulate, run_accesses
+
+def next_uses(reference_string):
+    """
+    Backward pass: next_use[i] is the position of the next reference to
+    the page at position i, or len(reference_string) if there is none
+    """
+    never = len(reference_string)
+    next_use = [never] * never
+    seen = {}
+    for i in range(never - 1, -1, -1):
+        page = reference_string[i]
+        next_use[i] = seen.get(page, never)
+        seen[page] = i
+    return next_use
+
+class OPTEngine:
+    """
+    Belady's optimal page replacement: evict the resident page whose
+    next use lies furthest in the future. Needs the whole reference
+    string up front for the next-use index. Resident pages sit in a
+    max-heap keyed by next use, with stale entries skipped lazily and
+    the heap rebuilt once they outnumber the live ones, so each
+    reference costs O(log frames) amortised.
+    """
+    def __init__(self, frames, reference_string):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.next_use = next_uses(reference_string)
+        self.position = 0
+        self.memory = {}  # page -> next use, in load order
+        self.heap = []  # (-next use, page), possibly stale
+        self.page_faults = 0
+        self.hits = 0
+
+    def access(self, page):
+        """
+        Reference the page at the next position of the reference
+        string. Returns (hit, replaced) where replaced is the evicted
+        page or None.
+        """
+        next_use = self.next_use[self.position]
+        self.position += 1
+        memory = self.memory
+
+        if page in memory:
+            self.hits += 1
+            memory[page] = next_use
+            self._push(next_use, page)
+            return True, None
+
+        self.page_faults += 1
+        old_page = None
+        if len(memory) == self.capacity:
+            # Page out the one needed furthest in the future
+            heap = self.heap
+            while True:
+                negated, candidate = heapq.heappop(heap)
+                if memory.get(candidate) == -negated:
+                    break
+            old_page = candidate
+            del memory[old_page]
+        memory[page] = next_use
+        self._push(next_use, page)
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path over the reference string given to the
+        constructor (or what remains of it): no per-step results or
+        logs. Returns the page faults so far.
+        """
+        return run_accesses(self, reference_string)
+
+    def _push(self, next_use, page):
+        heap = self.heap
+        heapq.heappush(heap, (-next_use, page))
+        if len(heap) > 2 * self.capacity + 16:
+            self.heap = [(-use, resident) for resident, use in self.memory.items()]
+            heapq.heapify(self.heap)
+
+    def frames(self):
+        """
+        Resident pages in load order
+        """
+        return list(self.memory)
+
+    def __contains__(self, page):
+        return page in self.memory
+
+    def __len__(self):
+        return len(self.memory)
+
+def opt_page_replacement(reference_string, frames, verbose=False, progress=None):
+    """
+    Simulate OPT over reference_string, which is read into a list first
+    if it is not already a sequence. When given, progress(steps) is
+    called every PROGRESS_INTERVAL references.
+    """
+    if not hasattr(reference_string, '__getitem__'):
+        reference_string = list(reference_string)
+    engine = OPTEngine(frames, reference_string)
+    detailed_log = SimulationLog()
+
+    if verbose:
+        print(f"\n--- OPT Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress)
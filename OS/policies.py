@@ -0,0 +1,70 @@
+from fifoEngine import FIFOEngine, fifo_page_replacement
+from lruEngine import LRUEngine, lru_page_replacement
+from clockEngine import ClockEngine, clock_page_replacement
+from arcEngine import ARCEngine, arc_page_replacement
+from twoQueueEngine import TwoQueueEngine, two_queue_page_replacement
+from lfuEngine import LFUEngine, lfu_page_replacement
+
+# Online policies compared against each other, by display name.
+# OPT needs the whole reference string and is only used as a baseline.
+ENGINES = {
+    'FIFO': FIFOEngine,
+    'LRU': LRUEngine,
+    'CLOCK': ClockEngine,
+    'ARC': ARCEngine,
+    '2Q': TwoQueueEngine,
+    'LFU': LFUEngine,
+}
+
+SIMULATORS = {
+    'FIFO': fifo_page_replacement,
+    'LRU': lru_page_replacement,
+    'CLOCK': clock_page_replacement,
+    'ARC': arc_page_replacement,
+    '2Q': two_queue_page_replacement,
+    'LFU': lfu_page_replacement,
+}
+
+# SimulationLog options matching the order each engine lists its frames
+LOG_OPTIONS = {
+    'LRU': {'touch_on_hit': True},
+    'CLOCK': {'replace_in_place': True},
+}
+
+# Compared by default; the rest of SIMULATORS can be selected explicitly
+COMPARED_POLICIES = ('FIFO', 'LRU', 'CLOCK')
+
+# Simulators taking resume=(previous reference string, previous log)
+RESUMABLE_POLICIES = ('FIFO', 'LRU')
+
+def result_key(policy):
+    """
+    Prefix for a policy's fields in result dicts, e.g. 'lru_faults'
+    """
+    return policy.lower()
+
+def pick_winner(faults):
+    """
+    faults maps policy -> page faults. Returns (winner, difference):
+    the policy with the fewest faults and its margin over the
+    runner-up, or ("TIE", 0) when several share the minimum.
+    """
+    ranked = sorted(faults.values())
+    best = ranked[0]
+    leaders = [policy for policy, count in faults.items() if count == best]
+    if len(leaders) > 1:
+        return "TIE", 0
+    return leaders[0], ranked[1] - best if len(ranked) > 1 else 0
+
+def choose_policies(text):
+    """
+    Parse a comma/space separated list of policy names (any case) into
+    a tuple in SIMULATORS order; an empty answer keeps the defaults
+    """
+    names = {name.upper() for name in text.replace(',', ' ').split()}
+    if not names:
+        return COMPARED_POLICIES
+    unknown = names - set(SIMULATORS)
+    if unknown:
+        raise ValueError(f"Unknown policies: {', '.join(sorted(unknown))}")
+    return tuple(policy for policy in SIMULATORS if policy in names)
@@ -0,0 +1,128 @@
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Allocation sites listed in the saved allocation report
+TOP_ALLOCATIONS = 25
+# Stack depth tracemalloc records per allocation
+TRACEBACK_FRAMES = 5
+
+# Where cProfile self time is attributed inside each phase, by source file
+_COMPONENTS = [
+    ('log build', ('simulationLog.py',)),
+    ('parse', ('traceReader.py', 'workloads.py')),
+    ('render', ('logView.py', 'guiCompare.py', 'tkinter')),
+    ('engine', ('Engine.py', 'lockstep.py', 'stackDistance.py', 'fifoCurve.py', 'batchFifo.py',
+                'shards.py', 'sweepExecutor.py', 'policies.py')),
+]
+
+# Held by the open Profiler: tracemalloc is process-wide, so only one
+# session may trace at a time
+_session = threading.Lock()
+
+def _component(filename, function):
+    if filename == '~':  # Built-ins
+        return 'render' if 'print' in function or 'write' in function else 'other'
+    for component, markers in _COMPONENTS:
+        if any(marker in filename for marker in markers):
+            return component
+    return 'other'
+
+class Profiler:
+    """
+    Profiling session for simulation runs. Each phase() runs under its
+    own cProfile profile in the calling thread (so a phase may run on a
+    worker thread) with tracemalloc's peak reset at its start, and
+    records its wall time and peak traced memory. finish() merges the
+    profiles into output_prefix.pstats, writes the top allocation sites
+    to output_prefix_allocations.txt and returns a text report, which
+    also splits each phase's time between engine, log build, parse and
+    render code.
+
+    tracemalloc is process-wide, so only one Profiler may be open at a
+    time: creating a second raises RuntimeError until the first is
+    finished. finish() must not run while a phase is still open. Used
+    as a context manager, the profiler is finished on leaving the
+    block, including when it raises.
+    """
+    def __init__(self, output_prefix="profile"):
+        if not _session.acquire(blocking=False):
+            raise RuntimeError("Another run is already being profiled")
+        self.output_prefix = output_prefix
+        self.phases = []  # (name, seconds, peak bytes, profile)
+        self.report = None
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(TRACEBACK_FRAMES)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+        return False
+
+    @contextmanager
+    def phase(self, name):
+        profile = cProfile.Profile()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start_time
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            self.phases.append((name, elapsed, peak, profile))
+
+    def finish(self):
+        """
+        Save the pstats dump and allocation sites, stop tracing, and
+        return the report; later calls return the same report
+        """
+        if self.report is not None:
+            return self.report
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if self.started_tracing:
+            tracemalloc.stop()
+        _session.release()
+
+        directory = os.path.dirname(self.output_prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stats_path = f"{self.output_prefix}.pstats"
+        allocations_path = f"{self.output_prefix}_allocations.txt"
+        profiles = [profile for _, _, _, profile in self.phases]
+        if profiles:
+            pstats.Stats(*profiles).dump_stats(stats_path)
+        with open(allocations_path, "w") as output:
+            output.write(f"Top {TOP_ALLOCATIONS} allocation sites still live at the end of the run\n\n")
+            if snapshot is not None:
+                for statistic in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                    output.write(f"{statistic}\n")
+
+        lines = ["PROFILE REPORT", f"{'Phase':<14}{'Time (s)':>10}{'Peak (MiB)':>12}"]
+        for name, elapsed, peak, profile in self.phases:
+            lines.append(f"{name:<14}{elapsed:>10.4f}{peak / (1 << 20):>12.2f}")
+            components = {}
+            for (filename, _, function), (_, _, self_time, _, _) in pstats.Stats(profile).stats.items():
+                component = _component(filename, function)
+                components[component] = components.get(component, 0) + self_time
+            for component, self_time in sorted(components.items(), key=lambda item: -item[1]):
+                lines.append(f"  {component:<12}{self_time:>10.4f}")
+        lines.append(f"Saved {stats_path if profiles else 'no profile'} and {allocations_path}")
+        self.report = "\n".join(lines)
+        return self.report
+
+def phase(profiler, name):
+    """
+    profiler.phase(name), or a no-op when profiler is None, so call
+    sites cost nothing with profiling off
+    """
+    return nullcontext() if profiler is None else profiler.phase(name)
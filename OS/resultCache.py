@@ -0,0 +1,84 @@
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+def trace_fingerprint(reference_string):
+    """
+    Digest of a reference string's pages, so cache keys stay small
+    however long the trace is
+    """
+    try:
+        data = array('q', reference_string).tobytes()
+    except OverflowError:  # Pages beyond 64 bits
+        data = ",".join(map(str, reference_string)).encode("ascii")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    Bounded cache of simulation results keyed by (trace fingerprint,
+    frames, policy), evicting the least recently used entry once
+    max_entries is reached. Lookups come from worker threads, so every
+    operation holds a lock.
+    """
+    def __init__(self, max_entries=32):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Cached result for key, or None
+        """
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+    def peek(self, key):
+        """
+        Cached result for key, or None, without counting a lookup or
+        refreshing the entry
+        """
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached result for key, calling compute() and storing its result
+        on a miss. Concurrent misses on one key may both compute.
+        """
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def hit_rate(self):
+        """
+        Percentage of lookups served from the cache
+        """
+        lookups = self.hits + self.misses
+        return (self.hits / lookups) * 100 if lookups > 0 else 0
+
+    def __len__(self):
+        return len(self.entries)
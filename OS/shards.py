@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fifoEngine import FIFOEngine
+from stackDistance import lru_fault_curve
+
+# Policies whose fault curves can be estimated from a sample
+SAMPLED_POLICIES = ('FIFO', 'LRU')
+
+_HASH_BITS = 24
+_HASH_RANGE = 1 << _HASH_BITS
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+def _page_hash(page, seed):
+    # Multiplicative (Fibonacci) hash to _HASH_BITS bits
+    return (((page ^ seed) * 0x9E3779B97F4A7C15) & _MASK) >> (64 - _HASH_BITS)
+
+def sample_trace(reference_string, rate, seed=0):
+    """
+    Spatial sampling (SHARDS, Waldspurger et al.): keep every reference
+    to the pages whose hash falls below rate, so a sampled page keeps
+    its whole reuse pattern. Returns (sampled pages, total references).
+    """
+    if not 0 < rate <= 1:
+        raise ValueError("Sampling rate must be in (0, 1]")
+    threshold = int(rate * _HASH_RANGE)
+    sampled = []
+    total_references = 0
+    for page in reference_string:
+        total_references += 1
+        if _page_hash(page, seed) < threshold:
+            sampled.append(page)
+    return sampled, total_references
+
+def approximate_fault_curves(reference_string, frame_sizes, rate, seed=0):
+    """
+    Estimated FIFO and LRU page faults for each of frame_sizes from a
+    spatially sampled trace. The sample behaves like the full trace
+    with rate times the frames, so each size f is simulated with
+    round(f * rate) frames and the sampled faults are scaled by
+    1 / rate. Faults are scaled rather than miss ratios because a
+    single hot page landing in or out of the sample swings the sampled
+    reference count, but mostly as hits (the SHARDS-adj correction).
+    Sizes under 0.5 / rate map to zero sampled frames and are estimated
+    as all faults, so pick a rate of at least a few hundred over the
+    smallest size for useful results.
+    Returns {policy: [faults per frame size]}.
+    """
+    sampled, total_references = sample_trace(reference_string, rate, seed)
+    scaled = [int(frames * rate + 0.5) for frames in frame_sizes]
+    lru_curve = lru_fault_curve(sampled, max(scaled, default=0))
+    # FIFO has no stack property; simulate only the sizes asked for
+    fifo_faults = {frames: FIFOEngine(frames).run(sampled) if frames else len(sampled)
+                   for frames in set(scaled)}
+
+    def scale(faults, frames):
+        if frames == 0:
+            return total_references
+        return min(total_references, round(faults / rate))
+
+    return {
+        'FIFO': [scale(fifo_faults[frames], frames) for frames in scaled],
+        'LRU': [scale(lru_curve[frames], frames) for frames in scaled],
+    }
+
+def _scenario_estimates(job):
+    # One scenario's estimates; runs in a worker process
+    reference_string, frame_sizes, rate, seed = job
+    return approximate_fault_curves(reference_string, frame_sizes, rate, seed)
+
+def sampled_sweep(scenarios, rate, policies=SAMPLED_POLICIES, seed=0, workers=None):
+    """
+    Approximate counterpart of run_sweep: the same table rows, with
+    faults and hit ratios estimated by approximate_fault_curves, one
+    scenario per job spread over a ProcessPoolExecutor (workers=1 runs
+    in this process)
+    """
+    unsupported = set(policies) - set(SAMPLED_POLICIES)
+    if unsupported:
+        raise ValueError(f"No sampled estimate for: {', '.join(sorted(unsupported))}")
+    jobs = [(scenario['reference_string'], scenario['frames'], rate, seed) for scenario in scenarios]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        all_estimates = list(map(_scenario_estimates, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            all_estimates = list(executor.map(_scenario_estimates, jobs))
+    table = []
+    for index, (scenario, estimates) in enumerate(zip(scenarios, all_estimates)):
+        reference_string = scenario['reference_string']
+        total_references = len(reference_string)
+        for position, frames in enumerate(scenario['frames']):
+            for policy in policies:
+                count = estimates[policy][position]
+                table.append({
+                    'scenario': index,
+                    'frames': frames,
+                    'policy': policy,
+                    'faults': count,
+                    'hit_ratio': ((total_references - count) / total_references) * 100 if total_references > 0 else 0
+                })
+    return table
+
+def lru_sampling_error(reference_string, frame_sizes, rate, seed=0):
+    """
+    Error of the sampled LRU estimate against exact LRU on the same
+    input, as (largest, mean) absolute miss-ratio error in percentage
+    points over frame_sizes. The exact counts come from lru_fault_curve,
+    which matches lru_page_replacement at every size in one pass.
+    """
+    if not hasattr(reference_string, '__getitem__'):
+        reference_string = list(reference_string)
+    total_references = len(reference_string)
+    if not frame_sizes or total_references == 0:
+        return 0.0, 0.0
+    exact = lru_fault_curve(reference_string, max(frame_sizes))
+    estimate = approximate_fault_curves(reference_string, frame_sizes, rate, seed)['LRU']
+    errors = [abs(exact[frames] - faults) / total_references * 100
+              for frames, faults in zip(frame_sizes, estimate)]
+    return max(errors), sum(errors) / len(errors)
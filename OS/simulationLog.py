@@ -0,0 +1,202 @@
+from array import array
+from itertools import islice
+
+HIT = 0
+FAULT = 1
+FAULT_REPLACED = 2
+
+PROGRESS_INTERVAL = 4096
+
+def common_prefix_length(previous, current, block=4096):
+    """
+    Number of leading references two reference strings share. Whole
+    blocks are compared as slices first, so long unchanged prefixes
+    are skipped at C speed.
+    """
+    limit = min(len(previous), len(current))
+    start = 0
+    while start + block <= limit and previous[start:start + block] == current[start:start + block]:
+        start += block
+    while start < limit and previous[start] == current[start]:
+        start += 1
+    return start
+
+def resume_run(previous_reference_string, previous_log, reference_string):
+    """
+    Where a rerun over an edited reference string can pick up from the
+    log of a run over the previous one (same policy and frames): the
+    last checkpoint at or before the first changed reference.
+    Returns (start, log, resident, hits, page_faults): log holds the
+    first start steps, resident the pages after them in frames() order.
+    """
+    changed = common_prefix_length(previous_reference_string, reference_string)
+    start = previous_log.checkpoint_before(changed)
+    log = previous_log.truncated(start)
+    hits = log.actions.count(HIT)
+    return start, log, log.checkpoints[-1], hits, start - hits
+
+class SimulationLog:
+    """
+    Compact per-step log of a page replacement run. Pages, actions and
+    replaced pages are kept in typed arrays (about 17 bytes per step)
+    instead of one dict and frame snapshot per step. Frame contents are
+    rebuilt on demand by replaying faults and evictions from the nearest
+    checkpoint, taken every checkpoint_interval steps.
+    Entries read back as the same dicts the simulators used to log:
+    {'step', 'page', 'action', 'frames', 'replaced'}.
+    replace_in_place is for engines that list frames by slot (CLOCK),
+    where a new page takes the slot of the page it replaced.
+    Pages beyond 64 bits switch the page columns to plain lists.
+    """
+    def __init__(self, touch_on_hit=False, replace_in_place=False, checkpoint_interval=1024):
+        self.touch_on_hit = touch_on_hit  # LRU moves a hit page to the end
+        self.replace_in_place = replace_in_place
+        self.checkpoint_interval = checkpoint_interval
+        self.pages = array('q')
+        self.actions = bytearray()
+        self.replaced = array('q')
+        self.checkpoints = [()]  # Frames before steps 0, k, 2k, ...
+        self._cursor = None  # (index, frames) of the last entry read
+
+    def record(self, page, hit, old_page, frames):
+        """
+        Append one step. frames is a callable returning the resident
+        pages after this step; it is only called at checkpoints.
+        """
+        try:
+            self.pages.append(page)
+        except OverflowError:  # Pages beyond 64 bits
+            self.pages = list(self.pages)
+            self.replaced = list(self.replaced)
+            self.pages.append(page)
+        if hit:
+            self.actions.append(HIT)
+            self.replaced.append(0)
+        elif old_page is None:
+            self.actions.append(FAULT)
+            self.replaced.append(0)
+        else:
+            self.actions.append(FAULT_REPLACED)
+            self.replaced.append(old_page)
+        if len(self.actions) % self.checkpoint_interval == 0:
+            self.checkpoints.append(tuple(frames()))
+
+    def checkpoint_before(self, steps):
+        """
+        Largest checkpointed step count not above steps
+        """
+        steps = min(steps, len(self.actions))
+        return (steps // self.checkpoint_interval) * self.checkpoint_interval
+
+    def truncated(self, steps):
+        """
+        Copy of this log holding only its first steps entries, ready to
+        record more. steps must be a checkpointed step count.
+        """
+        if steps % self.checkpoint_interval or steps > len(self.actions):
+            raise ValueError("Can only truncate at a checkpoint")
+        log = SimulationLog(self.touch_on_hit, self.replace_in_place, self.checkpoint_interval)
+        log.pages = self.pages[:steps]
+        log.actions = self.actions[:steps]
+        log.replaced = self.replaced[:steps]
+        log.checkpoints = self.checkpoints[:steps // self.checkpoint_interval + 1]
+        return log
+
+    def _apply(self, memory, index):
+        page = self.pages[index]
+        action = self.actions[index]
+        if self.replace_in_place:
+            if action == FAULT_REPLACED:
+                memory[memory.index(self.replaced[index])] = page
+            elif action == FAULT:
+                memory.append(page)
+        elif action == HIT:
+            if self.touch_on_hit:
+                del memory[page]
+                memory[page] = None
+        else:
+            if action == FAULT_REPLACED:
+                del memory[self.replaced[index]]
+            memory[page] = None
+
+    def frames_at(self, index):
+        """
+        Resident pages right after step index (0-based)
+        """
+        cursor = self._cursor
+        start = (index // self.checkpoint_interval) * self.checkpoint_interval
+        if cursor is not None and start <= cursor[0] <= index:
+            # Sequential reads continue from the previous entry
+            position, memory = cursor[0] + 1, cursor[1]
+        else:
+            position = start
+            checkpoint = self.checkpoints[index // self.checkpoint_interval]
+            memory = list(checkpoint) if self.replace_in_place else dict.fromkeys(checkpoint)
+        for i in range(position, index + 1):
+            self._apply(memory, i)
+        self._cursor = (index, memory)
+        return list(memory)
+
+    def entry(self, index):
+        action = self.actions[index]
+        return {
+            'step': index + 1,
+            'page': self.pages[index],
+            'action': 'Hit' if action == HIT else 'Page Fault',
+            'frames': self.frames_at(index),
+            'replaced': self.replaced[index] if action == FAULT_REPLACED else None
+        }
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.actions)
+        if not 0 <= index < len(self.actions):
+            raise IndexError("log index out of range")
+        return self.entry(index)
+
+    def __iter__(self):
+        for index in range(len(self.actions)):
+            yield self.entry(index)
+
+    def __len__(self):
+        return len(self.actions)
+
+def run_accesses(engine, reference_string):
+    """
+    Counters-only run for engines without a specialised loop: reference
+    every page through engine.access. Returns the page faults so far.
+    """
+    access = engine.access
+    for page in reference_string:
+        access(page)
+    return engine.page_faults
+
+def simulate(engine, reference_string, detailed_log, verbose=False, progress=None, start=0):
+    """
+    Drive engine over reference_string, recording every step in
+    detailed_log, and return (page faults, hit ratio, log). With start,
+    the first start references are skipped, the engine and log already
+    holding their state (see resume_run). When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    """
+    record = detailed_log.record
+    for i, page in enumerate(islice(reference_string, start, None), start):
+        hit, old_page = engine.access(page)
+        record(page, hit, old_page, engine.frames)
+        if progress is not None and (i + 1) % PROGRESS_INTERVAL == 0:
+            progress(i + 1)
+
+        if verbose:
+            memory = engine.frames()
+            if hit:
+                print(f"Step {i+1}: Hit: {page} -> Frames: {memory}")
+            elif old_page:
+                print(f"Step {i+1}: Page fault: {page} (replaced {old_page}) -> Frames: {memory}")
+            else:
+                print(f"Step {i+1}: Page fault: {page} -> Frames: {memory}")
+
+    # Counted from the engine so reference_string may be any iterable
+    total_references = engine.hits + engine.page_faults
+    hit_ratio = (engine.hits / total_references) * 100 if total_references > 0 else 0
+
+    return engine.page_faults, hit_ratio, detailed_log
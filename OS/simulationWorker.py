@@ -0,0 +1,52 @@
+import queue
+import threading
+
+class SimulationCancelled(Exception):
+    """
+    Raised inside a running task once it has been cancelled
+    """
+
+class SimulationTask:
+    """
+    Runs work(progress) on a daemon thread. The work reports how far it
+    got by calling progress(done), which also raises SimulationCancelled
+    once cancel() has been called. Progress and the outcome are posted
+    to a queue that the Tk main loop drains with poll() from after().
+    """
+    def __init__(self, work):
+        self.work = work
+        self.messages = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def progress(self, done):
+        if self.cancelled.is_set():
+            raise SimulationCancelled()
+        self.messages.put(('progress', done))
+
+    def _run(self):
+        try:
+            result = self.work(self.progress)
+        except SimulationCancelled:
+            self.messages.put(('cancelled', None))
+        except Exception as error:
+            self.messages.put(('error', error))
+        else:
+            self.messages.put(('done', result))
+
+    def poll(self):
+        """
+        Messages posted since the last poll, as (kind, value) pairs
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
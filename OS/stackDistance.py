@@ -0,0 +1,112 @@
+# Smallest capacity of the Fenwick tree behind stack_distances
+MIN_TREE_SIZE = 1024
+
+class FenwickTree:
+    """
+    Binary indexed tree over reference positions. stack_distances
+    renumbers the marked positions when it runs out of room, so the
+    tree is sized by the distinct pages, not the length of the
+    reference string.
+    """
+    def __init__(self, size=MIN_TREE_SIZE):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        tree = self.tree
+        size = self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """
+        Sum of positions 0..index-1
+        """
+        total = 0
+        tree = self.tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def compact(self, positions):
+        """
+        Renumber the marked positions, the values of the dict positions,
+        to 0, 1, ... in their order, in place, in a tree with room for
+        as many again. Returns the first free position.
+        """
+        keys = sorted(positions, key=positions.__getitem__)
+        marked = len(keys)
+        self.size = max(MIN_TREE_SIZE, 2 * marked)
+        tree = [0] * (self.size + 1)
+        # Linear-time build of a tree marking positions 0..marked-1
+        size = self.size
+        for index in range(1, size + 1):
+            if index <= marked:
+                tree[index] += 1
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self.tree = tree
+        for position, key in enumerate(keys):
+            positions[key] = position
+        return marked
+
+def stack_distances(reference_string):
+    """
+    Yield the LRU stack distance of every reference in one pass
+    (Mattson et al.). The distance is the number of distinct pages
+    referenced since the last use of this page, plus one, or None for
+    a first reference. Runs in O(n log n) with memory proportional to
+    the distinct pages: only the order of last accesses matters, so
+    when the tree fills they are renumbered into a fresh one.
+    """
+    last_access = {}
+    tree = FenwickTree()
+    distinct = 0
+    t = 0
+
+    for page in reference_string:
+        if t >= tree.size:
+            t = tree.compact(last_access)
+        previous = last_access.get(page)
+        if previous is None:
+            distinct += 1
+            yield None
+        else:
+            # Pages whose latest access lies after ours are above us on the stack
+            yield distinct - tree.prefix_sum(previous + 1) + 1
+            tree.add(previous, -1)
+        tree.add(t, 1)
+        last_access[page] = t
+        t += 1
+
+def lru_fault_curve(reference_string, max_frames=None):
+    """
+    LRU page faults for every frame count from 0 to max_frames in one
+    pass, using the stack (inclusion) property: a reference hits with
+    f frames exactly when its stack distance is at most f.
+    Returns a list where curve[f] is the fault count with f frames.
+    When max_frames is None the curve runs up to the largest stack
+    distance seen, after which it stays flat.
+    """
+    histogram = {}
+    total_references = 0
+
+    for distance in stack_distances(reference_string):
+        total_references += 1
+        if distance is not None and (max_frames is None or distance <= max_frames):
+            histogram[distance] = histogram.get(distance, 0) + 1
+
+    if max_frames is None:
+        max_frames = max(histogram, default=0)
+
+    curve = [total_references]
+    faults = total_references
+    for frames in range(1, max_frames + 1):
+        faults -= histogram.get(frames, 0)
+        curve.append(faults)
+
+    return curve
@@ -0,0 +1,188 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from batchFifo import batch_fifo_faults, np
+from fifoCurve import BATCH_MIN_SIZES, BATCH_MAX_CELLS
+from policies import ENGINES, COMPARED_POLICIES, result_key, pick_winner
+from stackDistance import lru_fault_curve
+
+POLICIES = COMPARED_POLICIES
+# Sweeps simulating fewer references than this in total run in-process,
+# where starting a process pool would cost more than the work
+IN_PROCESS_REFERENCES = 1 << 16
+
+def count_faults(policy, reference_string, frames):
+    return ENGINES[policy](frames).run(reference_string)
+
+def fifo_faults(reference_string, frames):
+    return count_faults('FIFO', reference_string, frames)
+
+def batches_fifo(frame_sizes):
+    """
+    Whether FIFO runs frame_sizes as one NumPy batch job: only with
+    enough sizes to beat one counters-only engine run per size
+    (run_job also checks the residency matrix fits)
+    """
+    return np is not None and len(frame_sizes) >= BATCH_MIN_SIZES
+
+def run_job(job):
+    """
+    Fault counts for one job: (scenario index, policy, reference
+    string, frame sizes). Runs in a worker process, so it only touches
+    picklable data. LRU covers all its frame sizes with one
+    stack-distance pass; FIFO uses the NumPy batch engine when it has
+    BATCH_MIN_SIZES frame sizes or more and the residency matrix stays
+    under BATCH_MAX_CELLS; otherwise policies run their counters-only
+    engine once per frame size.
+    """
+    scenario, policy, reference_string, frame_sizes = job
+    if policy == 'LRU':
+        curve = lru_fault_curve(reference_string, max(frame_sizes))
+        faults = [curve[frames] for frames in frame_sizes]
+    elif policy == 'FIFO':
+        if batches_fifo(frame_sizes) and len(frame_sizes) * len(set(reference_string)) <= BATCH_MAX_CELLS:
+            faults = batch_fifo_faults(np.asarray(reference_string), frame_sizes).tolist()
+        else:
+            faults = [fifo_faults(reference_string, frames) for frames in frame_sizes]
+    elif policy in ENGINES:
+        faults = [count_faults(policy, reference_string, frames) for frames in frame_sizes]
+    else:
+        raise ValueError(f"Unknown policy: {policy}")
+    total_references = len(reference_string)
+    return [
+        {
+            'scenario': scenario,
+            'frames': frames,
+            'policy': policy,
+            'faults': count,
+            'hit_ratio': ((total_references - count) / total_references) * 100 if total_references > 0 else 0
+        }
+        for frames, count in zip(frame_sizes, faults)
+    ]
+
+def run_jobs(function, jobs):
+    """
+    function(job) for each of several jobs, so a worker runs a chunk of
+    jobs per submission
+    """
+    return [function(job) for job in jobs]
+
+def build_jobs(scenarios, policies=POLICIES):
+    jobs = []
+    for index, scenario in enumerate(scenarios):
+        for policy in policies:
+            # Batched policies get one job per scenario, others one per frame size
+            if policy == 'LRU' or (policy == 'FIFO' and batches_fifo(scenario['frames'])):
+                jobs.append((index, policy, scenario['reference_string'], list(scenario['frames'])))
+            else:
+                for frames in scenario['frames']:
+                    jobs.append((index, policy, scenario['reference_string'], [frames]))
+    return jobs
+
+def iter_jobs(function, jobs, workers=None, chunksize=None, mp_context=None):
+    """
+    Run function (a module-level function, so it pickles) on every job,
+    spread over a ProcessPoolExecutor in chunks of jobs, and yield each
+    result as soon as its chunk finishes, in completion order.
+    workers=1 runs in this process. mp_context is passed to the pool;
+    callers with other threads running should give a 'spawn' context,
+    as forking a multi-threaded process can deadlock the children.
+    Closing the generator early cancels the jobs not yet started.
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(jobs)) or 1
+
+    if workers == 1:
+        for job in jobs:
+            yield function(job)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (4 * workers))
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+    try:
+        futures = [executor.submit(run_jobs, function, jobs[start:start + chunksize])
+                   for start in range(0, len(jobs), chunksize)]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def iter_sweep(scenarios, policies=POLICIES, workers=None, chunksize=None, mp_context=None):
+    """
+    Run every (scenario, frame size, policy) combination through
+    iter_jobs, yielding each job's rows as soon as its chunk finishes.
+    With workers None, sweeps under IN_PROCESS_REFERENCES run in this
+    process.
+    """
+    if workers is None:
+        references = sum(len(scenario['reference_string']) * len(scenario['frames']) for scenario in scenarios)
+        if references * len(policies) < IN_PROCESS_REFERENCES:
+            workers = 1
+    yield from iter_jobs(run_job, build_jobs(scenarios, policies), workers, chunksize, mp_context)
+
+def run_sweep(scenarios, policies=POLICIES, workers=None, chunksize=None, progress=None, mp_context=None):
+    """
+    All of iter_sweep's rows, one per combination, ordered by scenario,
+    frame size and policy. progress(jobs_done), if given, is called as
+    jobs finish and may raise to abandon the sweep.
+    """
+    table = []
+    sweep = iter_sweep(scenarios, policies, workers, chunksize, mp_context)
+    try:
+        for done, rows in enumerate(sweep, 1):
+            table.extend(rows)
+            if progress is not None:
+                progress(done)
+    finally:
+        sweep.close()
+
+    order = {policy: i for i, policy in enumerate(policies)}
+    table.sort(key=lambda row: (row['scenario'], scenarios[row['scenario']]['frames'].index(row['frames']),
+                                order[row['policy']]))
+    return table
+
+def compare_results(scenarios, table, policies=POLICIES):
+    """
+    Fold a sweep table into one result per (scenario, frame size),
+    with each policy's faults and hit ratio under '<policy>_faults' /
+    '<policy>_hit_ratio', the winner and its margin in faults
+    """
+    rows = {(row['scenario'], row['frames'], row['policy']): row for row in table}
+    all_results = []
+    for index, scenario in enumerate(scenarios):
+        for frames in scenario['frames']:
+            result = {
+                'test_name': f"{scenario['name']} - {frames} frames",
+                'reference_string': scenario['reference_string'],
+                'frames': frames
+            }
+            faults = {}
+            for policy in policies:
+                row = rows[(index, frames, policy)]
+                faults[policy] = row['faults']
+                result[f"{result_key(policy)}_faults"] = row['faults']
+                result[f"{result_key(policy)}_hit_ratio"] = row['hit_ratio']
+            result['winner'], result['difference'] = pick_winner(faults)
+            all_results.append(result)
+    return all_results
+
+def summarize(all_results, policies=POLICIES):
+    """
+    Wins per policy, ties, and average faults/hit ratios over compared
+    results
+    """
+    count = len(all_results)
+    summary = {
+        'total': count,
+        'ties': sum(1 for r in all_results if r['winner'] == 'TIE'),
+        'wins': {},
+        'avg_faults': {},
+        'avg_hit_ratio': {}
+    }
+    for policy in policies:
+        key = result_key(policy)
+        summary['wins'][policy] = sum(1 for r in all_results if r['winner'] == policy)
+        summary['avg_faults'][policy] = sum(r[f"{key}_faults"] for r in all_results) / count if count else 0
+        summary['avg_hit_ratio'][policy] = sum(r[f"{key}_hit_ratio"] for r in all_results) / count if count else 0
+    return summary
@@ -0,0 +1,250 @@
+from collections import deque
+
+from instrumentation import Histogram
+from simulationLog import PROGRESS_INTERVAL
+from stackDistance import stack_distances
+
+# Window lengths tau for the working-set sizes W(t, tau)
+WORKING_SET_WINDOWS = (4, 16, 64, 256, 1024, 4096)
+# References per block when splitting a trace into locality phases
+PHASE_WINDOW = 1024
+MIN_PHASE_WINDOW = 4
+# Blocks sharing less than this fraction of their pages (Jaccard) start a new phase
+PHASE_SIMILARITY = 0.5
+# LRU hit ratios (%) for which the frames needed are reported
+HIT_RATIO_TARGETS = (50, 75, 90)
+# Phases listed in full by summary()
+PHASES_SHOWN = 5
+
+class WorkingSetWindow:
+    """
+    Denning's working set over a sliding window: add(page) for the
+    reference at time t returns W(t, tau), the number of distinct pages
+    among the last tau references
+    """
+    def __init__(self, tau):
+        if tau < 1:
+            raise ValueError("Working-set window must be at least 1")
+        self.tau = tau
+        self.window = deque()
+        self.counts = {}
+
+    def add(self, page):
+        window = self.window
+        counts = self.counts
+        window.append(page)
+        counts[page] = counts.get(page, 0) + 1
+        if len(window) > self.tau:
+            old_page = window.popleft()
+            remaining = counts[old_page] - 1
+            if remaining:
+                counts[old_page] = remaining
+            else:
+                del counts[old_page]
+        return len(counts)
+
+def working_set_sizes(reference_string, tau):
+    """
+    Yield W(t, tau) for every reference t, reading the references once
+    """
+    working_set = WorkingSetWindow(tau)
+    add = working_set.add
+    for page in reference_string:
+        yield add(page)
+
+class PhaseDetector:
+    """
+    Splits a trace into locality phases: references are grouped into
+    blocks of window references, and a block whose pages overlap the
+    previous block's by less than similarity (Jaccard index) starts a
+    new phase. A final block shorter than half a window joins the
+    current phase.
+    """
+    def __init__(self, window=PHASE_WINDOW, similarity=PHASE_SIMILARITY):
+        self.window = window
+        self.similarity = similarity
+        self.time = 0
+        self.block = set()
+        self.block_start = 0
+        self.previous_block = None
+        self.phase_start = 0
+        self.phase_pages = set()
+        self.phases = []  # (first step, end step exclusive, distinct pages)
+
+    def observe(self, page):
+        self.block.add(page)
+        self.time += 1
+        if self.time - self.block_start == self.window:
+            self._close_block(True)
+
+    def _close_block(self, compare):
+        block = self.block
+        previous = self.previous_block
+        if compare and previous is not None:
+            overlap = len(block & previous) / len(block | previous)
+            if overlap < self.similarity:
+                self.phases.append((self.phase_start, self.block_start, len(self.phase_pages)))
+                self.phase_start = self.block_start
+                self.phase_pages = set()
+        self.phase_pages |= block
+        self.previous_block = block
+        self.block = set()
+        self.block_start = self.time
+
+    def finish(self):
+        """
+        The phases, closing the one still open
+        """
+        if self.block:
+            self._close_block(2 * (self.time - self.block_start) >= self.window)
+        if self.time > self.phase_start:
+            self.phases.append((self.phase_start, self.time, len(self.phase_pages)))
+            self.phase_start = self.time
+        return self.phases
+
+def locality_phases(reference_string, window=PHASE_WINDOW, similarity=PHASE_SIMILARITY):
+    """
+    (first step, end step, distinct pages) of each locality phase, see
+    PhaseDetector
+    """
+    detector = PhaseDetector(window, similarity)
+    for page in reference_string:
+        detector.observe(page)
+    return detector.finish()
+
+class TraceAnalysis:
+    """
+    What a reference string asks of memory, independent of any policy:
+    - reuse distances: distinct other pages referenced between two uses
+      of a page (LRU with f frames hits exactly the reuses at distance
+      under f), exact counts and power-of-two buckets;
+    - working sets: mean and peak W(t, tau) per window tau;
+    - locality phases from PhaseDetector.
+    """
+    def __init__(self, references, reuse_distances, reuse_histogram, working_sets, phases, phase_window):
+        self.references = references
+        self.reuse_distances = reuse_distances  # distance -> count
+        self.reuse_histogram = reuse_histogram
+        self.reuses = reuse_histogram.count
+        self.distinct_pages = references - self.reuses
+        self.working_sets = working_sets  # tau -> (mean, peak)
+        self.phases = phases
+        self.phase_window = phase_window
+
+    def median_reuse_distance(self):
+        seen = 0
+        for distance in sorted(self.reuse_distances):
+            seen += self.reuse_distances[distance]
+            if 2 * seen >= self.reuses:
+                return distance
+        return None
+
+    def lru_hit_ratio(self, frames):
+        hits = sum(count for distance, count in self.reuse_distances.items() if distance < frames)
+        return (hits / self.references) * 100 if self.references > 0 else 0
+
+    def frames_for_all_reuses(self):
+        """
+        Frames beyond which LRU gains nothing: the largest reuse
+        distance plus one
+        """
+        return max(self.reuse_distances, default=-1) + 1
+
+    def frames_for_hit_ratio(self, percent):
+        """
+        Fewest frames giving LRU at least percent hit ratio, or None when
+        cold misses alone rule it out
+        """
+        needed = percent / 100 * self.references
+        if needed <= 0:
+            return 0
+        hits = 0
+        for distance in sorted(self.reuse_distances):
+            hits += self.reuse_distances[distance]
+            if hits >= needed:
+                return distance + 1
+        return None
+
+    def summary(self):
+        """
+        A few lines for the console and GUI reports
+        """
+        lines = [f"References: {self.references}, distinct pages: {self.distinct_pages}"]
+        buckets = self.reuse_histogram.as_dict()['buckets']
+        if buckets:
+            lines.append(f"Reuse distance: median {self.median_reuse_distance()}, "
+                         f"mean {self.reuse_histogram.mean():.1f} pages")
+            items = [f"{label}: {count}" for label, count in buckets.items()]
+            for start in range(0, len(items), 5):
+                lines.append("  " + ", ".join(items[start:start + 5]))
+        else:
+            lines.append("Reuse distance: no page is referenced twice")
+        for tau, (mean, peak) in self.working_sets.items():
+            lines.append(f"Working set W(t, {tau}): mean {mean:.1f}, peak {peak}")
+        lines.append(f"Locality phases ({self.phase_window}-reference blocks): {len(self.phases)}")
+        for start, end, pages in self.phases[:PHASES_SHOWN]:
+            lines.append(f"  steps {start + 1}-{end}: {pages} pages")
+        if len(self.phases) > PHASES_SHOWN:
+            lines.append(f"  ... {len(self.phases) - PHASES_SHOWN} more")
+        targets = []
+        for percent in HIT_RATIO_TARGETS:
+            frames = self.frames_for_hit_ratio(percent)
+            targets.append(f"{percent}% -> {frames if frames is not None else 'unreachable'}")
+        lines.append(f"LRU frames for hit ratio: {', '.join(targets)}")
+        largest = self.frames_for_all_reuses()
+        lines.append(f"LRU hits every reuse with {largest} frames "
+                     f"(hit ratio {self.lru_hit_ratio(largest):.2f}%)")
+        return "\n".join(lines)
+
+def analyze_trace(reference_string, windows=WORKING_SET_WINDOWS, phase_window=None, progress=None):
+    """
+    TraceAnalysis of reference_string in a single pass, so a streamed
+    trace is read once; reuse distances come from stack_distances in
+    O(n log n). phase_window defaults to a sixteenth of the references
+    (between MIN_PHASE_WINDOW and PHASE_WINDOW) when the length is
+    known, PHASE_WINDOW otherwise. Windows at least as long as the
+    trace are left out, as they only count the pages seen so far.
+    When given, progress(references) is called every PROGRESS_INTERVAL
+    references and may raise to abandon the analysis.
+    """
+    if phase_window is None:
+        if hasattr(reference_string, '__len__'):
+            phase_window = min(PHASE_WINDOW, max(MIN_PHASE_WINDOW, len(reference_string) // 16))
+        else:
+            phase_window = PHASE_WINDOW
+    adds = [WorkingSetWindow(tau).add for tau in windows]
+    totals = [0] * len(windows)
+    peaks = [0] * len(windows)
+    detector = PhaseDetector(phase_window)
+
+    def observed():
+        for page in reference_string:
+            for index, add in enumerate(adds):
+                size = add(page)
+                totals[index] += size
+                if size > peaks[index]:
+                    peaks[index] = size
+            detector.observe(page)
+            yield page
+
+    reuse_distances = {}
+    reuse_histogram = Histogram()
+    references = 0
+    for distance in stack_distances(observed()):
+        references += 1
+        if distance is not None:
+            reuse_distances[distance - 1] = reuse_distances.get(distance - 1, 0) + 1
+            reuse_histogram.add(distance - 1)
+        if progress is not None and references % PROGRESS_INTERVAL == 0:
+            progress(references)
+
+    kept = [index for index, tau in enumerate(windows) if tau < references]
+    if not kept and windows:
+        kept = [0]
+    return TraceAnalysis(
+        references,
+        reuse_distances,
+        reuse_histogram,
+        {windows[index]: (totals[index] / references if references else 0, peaks[index]) for index in kept},
+        detector.finish(),
+        phase_window)
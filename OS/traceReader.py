@@ -0,0 +1,156 @@
+import argparse
+import mmap
+import re
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only memmap_binary_trace needs it
+    np = None
+
+_SEPARATORS = re.compile(r"[,\s]+")
+
+def parse_reference_string(text):
+    """
+    Parse page numbers separated by commas and/or whitespace, as typed
+    into the GUI or the interactive prompt
+    """
+    pages = [int(token) for token in _SEPARATORS.split(text.strip()) if token]
+    if not pages:
+        raise ValueError("Reference string is empty")
+    return pages
+
+def read_trace(path, chunk_size=1 << 20):
+    """
+    Stream page numbers from a trace file, one per line or comma/space
+    separated, reading chunk_size characters at a time so memory use
+    stays constant however large the file is.
+    """
+    with open(path, "r") as trace:
+        pending = ""
+        while True:
+            chunk = trace.read(chunk_size)
+            if not chunk:
+                break
+            tokens = _SEPARATORS.split(pending + chunk)
+            # The last token may continue in the next chunk
+            pending = tokens.pop()
+            for token in tokens:
+                if token:
+                    yield int(token)
+        if pending:
+            yield int(pending)
+
+# Binary trace: a 24-byte header (magic, array typecode, page count)
+# followed by little-endian unsigned page numbers, 8-byte aligned.
+BINARY_MAGIC = b"PGTRACE1"
+_HEADER = struct.Struct("<8sc7xQ")
+_WIDTHS = [('H', 0xFFFF, '<u2'), ('I', 0xFFFFFFFF, '<u4'), ('Q', 0xFFFFFFFFFFFFFFFF, '<u8')]
+
+def is_binary_trace(path):
+    with open(path, "rb") as trace:
+        return trace.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+def _read_header(trace):
+    header = trace.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Not a binary trace: file too short")
+    magic, typecode, count = _HEADER.unpack(header)
+    typecode = typecode.decode("ascii")
+    if magic != BINARY_MAGIC or typecode not in ('H', 'I', 'Q'):
+        raise ValueError("Not a binary trace")
+    return typecode, count
+
+def convert_text_trace(source, destination, typecode=None, chunk_size=1 << 16):
+    """
+    Stream a text trace (as read by read_trace) into the binary format.
+    With typecode None ('H', 'I' or 'Q' otherwise) the narrowest width
+    that fits is picked with an extra pass over the input.
+    Returns the number of pages written; raises ValueError on a page
+    that is negative or too large for the width.
+    """
+    if typecode is None:
+        largest = max(read_trace(source), default=0)
+        typecode = next((code for code, limit, _ in _WIDTHS if largest <= limit), 'Q')
+    limit = next(limit for code, limit, _ in _WIDTHS if code == typecode)
+
+    count = 0
+    with open(destination, "wb") as output:
+        output.write(_HEADER.pack(BINARY_MAGIC, typecode.encode("ascii"), 0))
+        chunk = array(typecode)
+        for page in read_trace(source):
+            if page < 0:
+                raise ValueError("Binary traces hold non-negative page numbers only")
+            if page > limit:
+                raise ValueError(f"Page {page} does not fit in width {typecode} (largest page {limit})")
+            chunk.append(page)
+            if len(chunk) == chunk_size:
+                count += _write_chunk(output, chunk)
+                chunk = array(typecode)
+        count += _write_chunk(output, chunk)
+        # Fill in the page count now that it is known
+        output.seek(0)
+        output.write(_HEADER.pack(BINARY_MAGIC, typecode.encode("ascii"), count))
+    return count
+
+def _write_chunk(output, chunk):
+    if sys.byteorder != "little":
+        chunk.byteswap()
+    chunk.tofile(output)
+    return len(chunk)
+
+def open_binary_trace(path):
+    """
+    Memory-map a binary trace and return its pages as a read-only
+    memoryview of ints, which the simulators can index and iterate
+    without copying the file into memory
+    """
+    with open(path, "rb") as trace:
+        typecode, count = _read_header(trace)
+        if count == 0:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(trace.fileno(), 0, access=mmap.ACCESS_READ)
+    pages = memoryview(mapped)[_HEADER.size:_HEADER.size + count * array(typecode).itemsize]
+    if sys.byteorder != "little":
+        # Big-endian hosts pay for one swapped copy
+        swapped = array(typecode, pages.tobytes())
+        swapped.byteswap()
+        return memoryview(swapped)
+    return pages.cast(typecode)
+
+def memmap_binary_trace(path):
+    """
+    Open a binary trace as a read-only numpy.memmap of page numbers
+    """
+    if np is None:
+        raise ImportError("memmap_binary_trace requires NumPy")
+    with open(path, "rb") as trace:
+        typecode, count = _read_header(trace)
+    dtype = next(dtype for code, _, dtype in _WIDTHS if code == typecode)
+    return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER.size, shape=(count,))
+
+def load_trace(path):
+    """
+    Pages of a trace file in either format: binary traces are
+    memory-mapped, text traces are streamed
+    """
+    if is_binary_trace(path):
+        return open_binary_trace(path)
+    return read_trace(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a text trace to the binary trace format")
+    parser.add_argument("source", help="Text trace: page numbers separated by commas, spaces or newlines")
+    parser.add_argument("destination", help="Binary trace to write")
+    parser.add_argument("--width", choices=['H', 'I', 'Q'], default=None,
+                        help="Page width: H=uint16, I=uint32, Q=uint64 (default: narrowest that fits)")
+    args = parser.parse_args()
+
+    try:
+        pages = convert_text_trace(args.source, args.destination, args.width)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {pages} pages to {args.destination}")
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+from simulationLog import SimulationLog, simulate, run_accesses
+
+class TwoQueueEngine:
+    """
+    2Q page replacement (Johnson and Shasha, full version). New pages
+    enter A1in, a FIFO of about a quarter of the frames; pages evicted
+    from it are remembered in the A1out ghost FIFO. Only a page that is
+    referenced again while remembered is promoted to Am, an LRU of the
+    remaining frames, so a one-off scan passes through A1in without
+    displacing the hot pages in Am. All queues are OrderedDicts, so
+    every step is O(1).
+    """
+    def __init__(self, frames, in_fraction=0.25, out_fraction=0.5):
+        if frames < 1:
+            raise ValueError("Number of frames must be at least 1")
+        self.capacity = frames
+        self.in_size = max(1, int(frames * in_fraction))
+        self.out_size = max(1, int(frames * out_fraction))
+        self.a1in = OrderedDict()  # Oldest first
+        self.a1out = OrderedDict()  # Ghosts, oldest first
+        self.am = OrderedDict()  # Least recently used first
+        self.resident = {}  # Resident pages in load order
+        self.page_faults = 0
+        self.hits = 0
+
+    def _reclaim(self):
+        # Free a frame when memory is full
+        if len(self.a1in) + len(self.am) < self.capacity:
+            return None
+        if len(self.a1in) > self.in_size or not self.am:
+            old_page = self.a1in.popitem(last=False)[0]
+            self.a1out[old_page] = None
+            if len(self.a1out) > self.out_size:
+                self.a1out.popitem(last=False)
+        else:
+            old_page = self.am.popitem(last=False)[0]
+        del self.resident[old_page]
+        return old_page
+
+    def access(self, page):
+        """
+        Reference a page. Returns (hit, replaced) where replaced is the
+        evicted page or None.
+        """
+        if page in self.am:
+            self.hits += 1
+            self.am.move_to_end(page)
+            return True, None
+        if page in self.a1in:
+            self.hits += 1
+            return True, None
+
+        self.page_faults += 1
+        old_page = self._reclaim()
+        if page in self.a1out:
+            # Re-referenced after leaving A1in: it is hot
+            del self.a1out[page]
+            self.am[page] = None
+        else:
+            self.a1in[page] = None
+        self.resident[page] = None
+        return False, old_page
+
+    def run(self, reference_string):
+        """
+        Counters-only fast path: reference every page of
+        reference_string without building per-step results or logs.
+        Returns the page faults so far.
+        """
+        return run_accesses(self, reference_string)
+
+    def frames(self):
+        """
+        Resident pages in load order
+        """
+        return list(self.resident)
+
+    def __contains__(self, page):
+        return page in self.resident
+
+    def __len__(self):
+        return len(self.resident)
+
+def two_queue_page_replacement(reference_string, frames, verbose=False, progress=None):
+    """
+    Simulate 2Q over reference_string. When given, progress(steps)
+    is called every PROGRESS_INTERVAL references.
+    """
+    engine = TwoQueueEngine(frames)
+    detailed_log = SimulationLog()
+
+    if verbose:
+        print(f"\n--- 2Q Simulation (Frames: {frames}) ---")
+
+    return simulate(engine, reference_string, detailed_log, verbose, progress)
@@ -0,0 +1,115 @@
+import bisect
+import itertools
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only as_array needs it
+    np = None
+
+# Every generator yields page numbers lazily. length=None streams
+# forever; the same seed always gives the same stream.
+
+def sequential(length=None, start=0):
+    """
+    Ever-increasing pages with no reuse, like a one-pass scan
+    """
+    pages = itertools.count(start)
+    return pages if length is None else itertools.islice(pages, length)
+
+def looping_scan(loop_size, length=None, start=0):
+    """
+    Scan pages start..start+loop_size-1 over and over
+    """
+    pages = itertools.cycle(range(start, start + loop_size))
+    return pages if length is None else itertools.islice(pages, length)
+
+def repeated(pattern, length=None):
+    """
+    Repeat a fixed pattern, e.g. [1, 2, 3]
+    """
+    pages = itertools.cycle(pattern)
+    return pages if length is None else itertools.islice(pages, length)
+
+def uniform_random(universe, length=None, seed=0):
+    """
+    Pages drawn uniformly from 0..universe-1
+    """
+    rng = random.Random(seed)
+    count = itertools.count() if length is None else range(length)
+    for _ in count:
+        yield rng.randrange(universe)
+
+def zipf(universe, alpha=1.0, length=None, seed=0):
+    """
+    Pages 0..universe-1 with P(page k) proportional to 1/(k+1)**alpha
+    """
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1.0 / (rank + 1) ** alpha for rank in range(universe)))
+    total = cumulative[-1]
+    count = itertools.count() if length is None else range(length)
+    for _ in count:
+        yield min(bisect.bisect_left(cumulative, rng.random() * total), universe - 1)
+
+def locality(working_set, universe, run_length=3, length=None, seed=0):
+    """
+    Short runs of the same page, mostly inside a small working set,
+    like the "Locality of Reference" scenario
+    """
+    rng = random.Random(seed)
+    hot = rng.sample(range(universe), min(working_set, universe))
+    produced = 0
+    while length is None or produced < length:
+        page = rng.choice(hot) if rng.random() < 0.9 else rng.randrange(universe)
+        for _ in range(rng.randint(1, run_length)):
+            if length is not None and produced >= length:
+                return
+            yield page
+            produced += 1
+
+def phase_shift(working_set, phase_length, universe, length=None, seed=0):
+    """
+    Uniform references within a working set that moves to a new
+    random region of the page universe every phase_length references
+    """
+    rng = random.Random(seed)
+    produced = 0
+    while length is None or produced < length:
+        base = rng.randrange(max(universe - working_set, 1))
+        for _ in range(phase_length):
+            if length is not None and produced >= length:
+                return
+            yield base + rng.randrange(working_set)
+            produced += 1
+
+def mixture(streams, weights, length=None, seed=0):
+    """
+    Interleave infinite streams, choosing the next source by weight
+    """
+    rng = random.Random(seed)
+    streams = [iter(stream) for stream in streams]
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1]
+    count = itertools.count() if length is None else range(length)
+    for _ in count:
+        yield next(streams[bisect.bisect_right(cumulative, rng.random() * total)])
+
+def as_array(pages, length, dtype="int64"):
+    """
+    Materialise the first length pages of a stream as a NumPy array
+    """
+    if np is None:
+        raise ImportError("as_array requires NumPy")
+    return np.fromiter(pages, dtype=dtype, count=length)
+
+WORKLOADS = {
+    'sequential': lambda length, universe, seed: sequential(length),
+    'loop': lambda length, universe, seed: looping_scan(universe, length),
+    'uniform': lambda length, universe, seed: uniform_random(universe, length, seed),
+    'zipf': lambda length, universe, seed: zipf(universe, 1.0, length, seed),
+    'locality': lambda length, universe, seed: locality(max(universe // 10, 1), universe, 3, length, seed),
+    'phase': lambda length, universe, seed: phase_shift(max(universe // 10, 1), max(length // 10, 1),
+                                                        universe, length, seed),
+    'mixture': lambda length, universe, seed: mixture(
+        [zipf(universe, 1.0, seed=seed + 1), looping_scan(universe)], [0.8, 0.2], length, seed),
+}